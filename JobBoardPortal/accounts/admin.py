@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User, Group
@@ -6,6 +8,12 @@ from django.utils.decorators import method_decorator
 from .models import UserProfile
 
 
+@lru_cache(maxsize=8)
+def _user_type_display(code):
+    """Display label for a user type code"""
+    return dict(UserProfile.USER_TYPE_CHOICES).get(code, code)
+
+
 class UserProfileInline(admin.StackedInline):
     """Inline admin for UserProfile"""
     model = UserProfile
@@ -24,11 +32,16 @@ class UserAdmin(BaseUserAdmin):
     
     def get_user_type(self, obj):
         """Get user type from profile"""
-        if hasattr(obj, 'userprofile'):
-            return obj.userprofile.get_user_type_display()
+        profile = getattr(obj, 'userprofile', None)
+        if profile:
+            return _user_type_display(profile.user_type)
         return 'No Profile'
     get_user_type.short_description = 'User Type'
     get_user_type.admin_order_field = 'userprofile__user_type'
+    
+    def get_queryset(self, request):
+        """Optimize queryset with select_related"""
+        return super().get_queryset(request).select_related('userprofile')
 
 
 @admin.register(UserProfile)
@@ -38,6 +51,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ('user_type', 'user__date_joined', 'user__is_active')
     search_fields = ('user__username', 'user__email', 'user__first_name', 'user__last_name', 'phone', 'location')
     readonly_fields = ('user', 'get_date_joined')
+    autocomplete_fields = ['user']
     list_per_page = 25
     
     fieldsets = (
@@ -65,8 +79,11 @@ class UserProfileAdmin(admin.ModelAdmin):
     get_date_joined.admin_order_field = 'user__date_joined'
     
     def get_queryset(self, request):
-        """Optimize queryset with select_related"""
-        return super().get_queryset(request).select_related('user')
+        """Optimize queryset with select_related, loading only the displayed columns"""
+        return super().get_queryset(request).select_related('user').only(
+            'user_type', 'phone', 'location', 'profile_picture',
+            'user__id', 'user__username', 'user__email', 'user__date_joined'
+        )
 
 
 # Re-register UserAdmin
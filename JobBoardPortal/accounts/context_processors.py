@@ -1,3 +1,7 @@
+from .mixins import get_request_user_type
+from .models import UserProfile
+
+
 def last_visited_job(request):
     """
     Context processor to add last visited job information to all templates
@@ -19,13 +23,16 @@ def user_navigation(request):
     """
     context = {}
     
-    if request.user.is_authenticated and hasattr(request.user, 'userprofile'):
-        user_profile = request.user.userprofile
-        context['user_navigation'] = {
-            'user_type': user_profile.user_type,
-            'is_employer': user_profile.user_type == 'employer',
-            'is_jobseeker': user_profile.user_type == 'jobseeker',
-            'display_name': request.user.first_name or request.user.username,
-        }
+    if request.user.is_authenticated:
+        # Looked up once per request by UserProfileMiddleware
+        user_type = get_request_user_type(request)
+        if user_type is not None:
+            context['user_navigation'] = {
+                'user_type': user_type,
+                'get_user_type_display': dict(UserProfile.USER_TYPE_CHOICES).get(user_type, user_type),
+                'is_employer': user_type == 'employer',
+                'is_jobseeker': user_type == 'jobseeker',
+                'display_name': request.user.first_name or request.user.username,
+            }
     
     return context
\ No newline at end of file
@@ -1,108 +1,159 @@
 from django import forms
+from django.contrib.auth import password_validation
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
 from .models import UserProfile
 import re
-import os
+
+
+# Validation patterns, compiled once at import time
+# 10-15 digits with an optional leading '+'; spaces, dashes and
+# parentheses are allowed anywhere as separators
+_PHONE_RE = re.compile(r'[\s\-\(\)]*\+?(?:[\s\-\(\)]*[0-9]){10,15}[\s\-\(\)]*')
+_NAME_RE = re.compile(r'^[a-zA-Z\s]{2,30}$')
+
+# Upload limits, resolved once from settings
+_ALLOWED_IMAGE_EXTS = frozenset(e.lower() for e in getattr(settings, 'ALLOWED_IMAGE_EXTENSIONS', ()))
+_MAX_UPLOAD = getattr(settings, 'MAX_UPLOAD_SIZE', 5 * 1024 * 1024)
+
+DUPLICATE_EMAIL_MESSAGE = 'A user with this email already exists.'
+
+
+def save_user_with_unique_email(form, user, update_fields=None):
+    """
+    Save user, turning a unique email or username violation (e.g. a
+    concurrent registration) into a form error on that field. Any other
+    integrity error is re-raised.
+    """
+    try:
+        with transaction.atomic():
+            user.save(update_fields=update_fields)
+    except IntegrityError:
+        others = User.objects.exclude(pk=user.pk)
+        if others.filter(email__iexact=user.email).exists():
+            field, message = 'email', DUPLICATE_EMAIL_MESSAGE
+        elif others.filter(username=user.username).exists():
+            field = 'username'
+            message = User._meta.get_field('username').error_messages['unique']
+        else:
+            raise
+        form.add_error(field, message)
+        raise ValidationError(message)
 
 
 class BaseRegistrationForm(UserCreationForm):
     """Base registration form with common fields"""
     email = forms.EmailField(
         required=True,
-        help_text="Enter a valid email address"
+        help_text="Enter a valid email address",
+        widget=forms.EmailInput(attrs={
+            'class': 'form-control',
+            'required': True,
+            'placeholder': 'Enter email address'
+        })
     )
     first_name = forms.CharField(
         max_length=30, 
         required=True,
-        help_text="Enter your first name"
+        help_text="Enter your first name",
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'required': True,
+            'placeholder': 'First name',
+            'pattern': '[a-zA-Z\\s\'\\-]{2,30}',
+            'title': 'First name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only'
+        })
     )
     last_name = forms.CharField(
         max_length=30, 
         required=True,
-        help_text="Enter your last name"
+        help_text="Enter your last name",
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'required': True,
+            'placeholder': 'Last name',
+            'pattern': '[a-zA-Z\\s\'\\-]{2,30}',
+            'title': 'Last name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only'
+        })
     )
     phone = forms.CharField(
         max_length=15, 
         required=True,
-        help_text="Enter your phone number (e.g., +1-555-123-4567)"
+        help_text="Enter your phone number (e.g., +1-555-123-4567)",
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'required': True,
+            'placeholder': 'Enter phone number',
+            'pattern': '[+]?[0-9\\s\\-\\(\\)]{10,15}',
+            'title': 'Enter a valid phone number'
+        })
     )
     location = forms.CharField(
         max_length=100, 
         required=True,
-        help_text="Enter your city and state/country"
+        help_text="Enter your city and state/country",
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'required': True,
+            'placeholder': 'Enter your location',
+            'minlength': '2'
+        })
+    )
+    # Redeclared from UserCreationForm so the Bootstrap attrs live on the class
+    password1 = forms.CharField(
+        label=_("Password"),
+        strip=False,
+        widget=forms.PasswordInput(attrs={
+            'autocomplete': 'new-password',
+            'class': 'form-control',
+            'required': True,
+            'placeholder': 'Enter password',
+            'minlength': '8'
+        }),
+        help_text=password_validation.password_validators_help_text_html(),
+    )
+    password2 = forms.CharField(
+        label=_("Password confirmation"),
+        strip=False,
+        widget=forms.PasswordInput(attrs={
+            'autocomplete': 'new-password',
+            'class': 'form-control',
+            'required': True,
+            'placeholder': 'Enter password',
+            'minlength': '8'
+        }),
+        help_text=_("Enter the same password as before, for verification."),
     )
     
     class Meta:
         model = User
         fields = ('username', 'first_name', 'last_name', 'email', 'phone', 'location', 'password1', 'password2')
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Add Bootstrap classes and validation attributes
-        for field_name, field in self.fields.items():
-            field.widget.attrs.update({
+        widgets = {
+            'username': forms.TextInput(attrs={
                 'class': 'form-control',
-                'required': field.required
-            })
-            
-            if field_name == 'username':
-                field.widget.attrs.update({
-                    'placeholder': 'Choose a username',
-                    'pattern': '[a-zA-Z0-9_]{3,30}',
-                    'title': 'Username must be 3-30 characters, letters, numbers, and underscores only'
-                })
-            elif field_name == 'first_name':
-                field.widget.attrs.update({
-                    'placeholder': 'First name',
-                    'pattern': '[a-zA-Z\\s\'\\-]{2,30}',
-                    'title': 'First name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only'
-                })
-            elif field_name == 'last_name':
-                field.widget.attrs.update({
-                    'placeholder': 'Last name',
-                    'pattern': '[a-zA-Z\\s\'\\-]{2,30}',
-                    'title': 'Last name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only'
-                })
-            elif field_name == 'email':
-                field.widget.attrs.update({
-                    'placeholder': 'Enter email address',
-                    'type': 'email'
-                })
-            elif field_name == 'phone':
-                field.widget.attrs.update({
-                    'placeholder': 'Enter phone number',
-                    'pattern': '[+]?[0-9\\s\\-\\(\\)]{10,15}',
-                    'title': 'Enter a valid phone number'
-                })
-            elif field_name == 'location':
-                field.widget.attrs.update({
-                    'placeholder': 'Enter your location',
-                    'minlength': '2'
-                })
-            elif field_name in ['password1', 'password2']:
-                field.widget.attrs.update({
-                    'placeholder': 'Enter password',
-                    'minlength': '8'
-                })
+                'required': True,
+                'placeholder': 'Choose a username',
+                'pattern': '[a-zA-Z0-9_]{3,30}',
+                'title': 'Username must be 3-30 characters, letters, numbers, and underscores only'
+            }),
+        }
     
     def clean_email(self):
         """Validate email uniqueness"""
         email = self.cleaned_data.get('email')
-        if email and User.objects.filter(email=email).exists():
-            raise ValidationError('A user with this email already exists.')
+        if email and User.objects.filter(email__iexact=email).exists():
+            raise ValidationError(DUPLICATE_EMAIL_MESSAGE)
         return email
     
     def clean_phone(self):
         """Validate phone number format"""
         phone = self.cleaned_data.get('phone')
-        if phone:
-            # Remove spaces, dashes, parentheses for validation
-            clean_phone = re.sub(r'[\s\-\(\)]', '', phone)
-            if not re.match(r'^[+]?[0-9]{10,15}$', clean_phone):
-                raise ValidationError('Enter a valid phone number (10-15 digits).')
+        if phone and not _PHONE_RE.fullmatch(phone):
+            raise ValidationError('Enter a valid phone number (10-15 digits).')
         return phone
     
     def clean_first_name(self):
@@ -110,7 +161,7 @@ class BaseRegistrationForm(UserCreationForm):
         first_name = self.cleaned_data.get('first_name')
         if first_name:
             first_name = first_name.strip()
-            if not re.match(r'^[a-zA-Z\s]{2,30}$', first_name):
+            if not _NAME_RE.match(first_name):
                 raise ValidationError('First name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only.')
         return first_name
     
@@ -119,7 +170,7 @@ class BaseRegistrationForm(UserCreationForm):
         last_name = self.cleaned_data.get('last_name')
         if last_name:
             last_name = last_name.strip()
-            if not re.match(r'^[a-zA-Z\s]{2,30}$', last_name):
+            if not _NAME_RE.match(last_name):
                 raise ValidationError('Last name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only.')
         return last_name
     
@@ -143,7 +194,7 @@ class EmployerRegistrationForm(BaseRegistrationForm):
         user.last_name = self.cleaned_data['last_name']
         
         if commit:
-            user.save()
+            save_user_with_unique_email(self, user)
             # Update the UserProfile with employer-specific data
             user_profile = user.userprofile
             user_profile.user_type = 'employer'
@@ -164,7 +215,7 @@ class JobSeekerRegistrationForm(BaseRegistrationForm):
         user.last_name = self.cleaned_data['last_name']
         
         if commit:
-            user.save()
+            save_user_with_unique_email(self, user)
             # Update the UserProfile with job seeker-specific data
             user_profile = user.userprofile
             user_profile.user_type = 'jobseeker'
@@ -245,18 +296,21 @@ class UserProfileForm(forms.ModelForm):
         """Validate email uniqueness (excluding current user)"""
         email = self.cleaned_data.get('email')
         if email and self.instance and self.instance.user:
-            if User.objects.filter(email=email).exclude(id=self.instance.user.id).exists():
-                raise ValidationError('A user with this email already exists.')
+            # Unchanged email needs no uniqueness check
+            if email.lower() == (self.instance.user.email or '').lower():
+                return email
+            if User.objects.filter(email__iexact=email).exclude(id=self.instance.user.id).exists():
+                raise ValidationError(DUPLICATE_EMAIL_MESSAGE)
         return email
     
     def clean_phone(self):
         """Validate phone number format"""
         phone = self.cleaned_data.get('phone')
-        if phone:
-            # Remove spaces, dashes, parentheses for validation
-            clean_phone = re.sub(r'[\s\-\(\)]', '', phone)
-            if not re.match(r'^[+]?[0-9]{10,15}$', clean_phone):
-                raise ValidationError('Enter a valid phone number (10-15 digits).')
+        if phone and phone == getattr(self.instance, 'phone', None):
+            # Already validated when it was stored
+            return phone
+        if phone and not _PHONE_RE.fullmatch(phone):
+            raise ValidationError('Enter a valid phone number (10-15 digits).')
         return phone
     
     def clean_first_name(self):
@@ -264,7 +318,7 @@ class UserProfileForm(forms.ModelForm):
         first_name = self.cleaned_data.get('first_name')
         if first_name:
             first_name = first_name.strip()
-            if not re.match(r'^[a-zA-Z\s]{2,30}$', first_name):
+            if not _NAME_RE.match(first_name):
                 raise ValidationError('First name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only.')
         return first_name
     
@@ -273,7 +327,7 @@ class UserProfileForm(forms.ModelForm):
         last_name = self.cleaned_data.get('last_name')
         if last_name:
             last_name = last_name.strip()
-            if not re.match(r'^[a-zA-Z\s]{2,30}$', last_name):
+            if not _NAME_RE.match(last_name):
                 raise ValidationError('Last name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only.')
         return last_name
     
@@ -292,16 +346,16 @@ class UserProfileForm(forms.ModelForm):
         
         if profile_picture:
             # Check file extension
-            ext = os.path.splitext(profile_picture.name)[1].lower()
-            if ext not in settings.ALLOWED_IMAGE_EXTENSIONS:
+            ext = '.' + profile_picture.name.rsplit('.', 1)[-1].lower()
+            if ext not in _ALLOWED_IMAGE_EXTS:
                 raise ValidationError(
                     f'Invalid file type. Allowed formats: {", ".join(settings.ALLOWED_IMAGE_EXTENSIONS)}'
                 )
             
             # Check file size
-            if profile_picture.size > settings.MAX_UPLOAD_SIZE:
+            if profile_picture.size > _MAX_UPLOAD:
                 raise ValidationError(
-                    f'File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / (1024*1024):.1f}MB'
+                    f'File too large. Maximum size: {_MAX_UPLOAD / (1024*1024):.1f}MB'
                 )
         
         return profile_picture
@@ -313,6 +367,10 @@ class UserProfileForm(forms.ModelForm):
             profile.user.first_name = self.cleaned_data['first_name']
             profile.user.last_name = self.cleaned_data['last_name']
             profile.user.email = self.cleaned_data['email']
-            profile.user.save()
-            profile.save()
+            # Only write the columns this form edits
+            with transaction.atomic():
+                save_user_with_unique_email(
+                    self, profile.user, update_fields=['first_name', 'last_name', 'email']
+                )
+                profile.save(update_fields=['phone', 'location', 'profile_picture'])
         return profile
@@ -1,12 +1,18 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from datetime import datetime, timedelta
 import random
 
 from JobBoardPortal.accounts.models import UserProfile
 from JobBoardPortal.companies.models import Company
-from JobBoardPortal.jobs.models import Job, Application, JobAlert
+from JobBoardPortal.jobs.models import Job, Application, JobAlert, JobAlertNotification
+
+# Number of rows sent per INSERT statement by bulk_create
+BATCH_SIZE = 500
 
 
 class Command(BaseCommand):
@@ -37,6 +43,7 @@ class Command(BaseCommand):
             help='Clear existing sample data before creating new data'
         )
 
+    @transaction.atomic
     def handle(self, *args, **options):
         if options['clear']:
             self.stdout.write('Clearing existing sample data...')
@@ -77,22 +84,35 @@ class Command(BaseCommand):
 
     def clear_sample_data(self):
         """Clear existing sample data (excluding superusers)"""
-        # Delete applications first (foreign key constraints)
-        Application.objects.filter(applicant__userprofile__isnull=False).delete()
-        
-        # Delete job alerts
-        JobAlert.objects.filter(user__userprofile__isnull=False).delete()
+        has_profile = Q(user__userprofile__isnull=False)
         
-        # Delete jobs
-        Job.objects.filter(company__user__userprofile__isnull=False).delete()
+        # Sample tables are deleted with one DELETE each, children before
+        # parents, instead of loading every row to run Python-side cascades
+        # and delete signals. handle() wraps this in a transaction.
+        self.raw_delete(JobAlertNotification.objects.filter(
+            Q(job_alert__user__userprofile__isnull=False) |
+            Q(job__company__user__userprofile__isnull=False)
+        ))
+        self.raw_delete(Application.objects.filter(
+            Q(applicant__userprofile__isnull=False) |
+            Q(job__company__user__userprofile__isnull=False)
+        ))
+        self.raw_delete(JobAlert.objects.filter(has_profile))
+        self.raw_delete(Job.objects.filter(company__user__userprofile__isnull=False))
+        self.raw_delete(Company.objects.filter(has_profile))
+        self.raw_delete(UserProfile.objects.all())
         
-        # Delete companies
-        Company.objects.filter(user__userprofile__isnull=False).delete()
+        # Raw deletes skip the signal that keeps the alert count current
+        JobAlert.clear_count()
         
-        # Delete user profiles and users (except superusers)
-        UserProfile.objects.all().delete()
+        # Users keep the regular delete so auth's own relations (groups,
+        # permissions, admin log entries) are cascaded correctly
         User.objects.filter(is_superuser=False).delete()
 
+    def raw_delete(self, queryset):
+        """Delete all rows matched by queryset without fetching them"""
+        queryset.order_by()._raw_delete(queryset.db)
+
     def create_users(self, count):
         """Create sample users with profiles"""
         employers = []
@@ -104,36 +124,54 @@ class Command(BaseCommand):
         locations = ['New York, NY', 'Los Angeles, CA', 'Chicago, IL', 'Houston, TX', 'Phoenix, AZ', 
                     'Philadelphia, PA', 'San Antonio, TX', 'San Diego, CA', 'Dallas, TX', 'San Jose, CA']
         
-        for i in range(count):
+        users = []
+        profiles = []
+        
+        # All sample users share a password, so hash it only once
+        hashed_password = make_password('password123')
+        
+        # Draw every random field for all users up front
+        fields = zip(
+            random.choices(first_names, k=count),
+            random.choices(last_names, k=count),
+            random.choices(locations, k=count),
+            random.choices(range(100, 1000), k=count),
+            random.choices(range(1000, 10000), k=count),
+        )
+        
+        for i, (first_name, last_name, location, phone_prefix, phone_line) in enumerate(fields):
             # Alternate between employers and job seekers
             user_type = 'employer' if i % 3 == 0 else 'jobseeker'
             
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
             username = f"{first_name.lower()}{last_name.lower()}{i}"
             email = f"{username}@example.com"
             
-            # Create user
-            user = User.objects.create_user(
+            user = User(
                 username=username,
                 email=email,
-                password='password123',
+                password=hashed_password,
                 first_name=first_name,
                 last_name=last_name
             )
+            users.append(user)
             
-            # Update the automatically created profile
-            profile = user.userprofile
-            profile.user_type = user_type
-            profile.phone = f"555-{random.randint(100, 999)}-{random.randint(1000, 9999)}"
-            profile.location = random.choice(locations)
-            profile.save()
+            profiles.append(UserProfile(
+                user=user,
+                user_type=user_type,
+                phone=f"555-{phone_prefix}-{phone_line}",
+                location=location
+            ))
             
             if user_type == 'employer':
                 employers.append(user)
             else:
                 job_seekers.append(user)
         
+        # bulk_create does not send post_save, so profiles are inserted here
+        # instead of by the create_user_profile signal
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        UserProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+        
         return employers, job_seekers
 
     def create_companies(self, employers):
@@ -156,17 +194,25 @@ class Command(BaseCommand):
             'Full-service technology consultancy with expertise in cloud solutions.'
         ]
         
-        for employer in employers:
-            company = Company.objects.create(
+        count = len(employers)
+        fields = zip(
+            employers,
+            random.choices(company_names, k=count),
+            random.choices(range(1, 101), k=count),
+            random.choices(company_descriptions, k=count),
+        )
+        
+        for employer, name, suffix, description in fields:
+            company = Company(
                 user=employer,
-                name=random.choice(company_names) + f" {random.randint(1, 100)}",
-                description=random.choice(company_descriptions),
+                name=f"{name} {suffix}",
+                description=description,
                 website=f"https://www.{employer.username}company.com",
                 location=employer.userprofile.location
             )
             companies.append(company)
         
-        return companies
+        return Company.objects.bulk_create(companies, batch_size=BATCH_SIZE)
 
     def create_jobs(self, companies, count):
         """Create sample job postings"""
@@ -193,24 +239,31 @@ class Command(BaseCommand):
             'Technical degree\n1+ years of experience\nEager to learn\nCollaborative mindset'
         ]
         
-        for i in range(count):
-            company = random.choice(companies)
-            
-            # Create deadline between 1-90 days from now
-            deadline = timezone.now().date() + timedelta(days=random.randint(1, 90))
-            
-            job = Job.objects.create(
+        today = timezone.localdate()
+        fields = zip(
+            random.choices(companies, k=count),
+            random.choices(job_titles, k=count),
+            random.choices(job_descriptions, k=count),
+            random.choices(requirements, k=count),
+            random.choices(range(40000, 150001), k=count),
+            # Deadline between 1-90 days from now
+            random.choices(range(1, 91), k=count),
+        )
+        
+        for company, title, description, job_requirements, salary, days in fields:
+            job = Job(
                 company=company,
-                title=random.choice(job_titles),
-                description=random.choice(job_descriptions),
-                requirements=random.choice(requirements),
+                title=title,
+                description=description,
+                requirements=job_requirements,
                 location=company.location,
-                salary=random.randint(40000, 150000),
-                deadline=deadline
+                salary=salary,
+                deadline=today + timedelta(days=days)
             )
             jobs.append(job)
         
-        return jobs
+        # bulk_create skips post_save, so no job alert notifications are sent
+        return Job.objects.bulk_create(jobs, batch_size=BATCH_SIZE)
 
     def create_applications(self, job_seekers, jobs, count):
         """Create sample job applications"""
@@ -225,38 +278,36 @@ class Command(BaseCommand):
         
         statuses = ['applied', 'under_review', 'shortlisted', 'rejected']
         
-        # Track applications to prevent duplicates
-        applied_combinations = set()
-        
-        for i in range(count):
-            # Ensure no duplicate applications
-            attempts = 0
-            while attempts < 50:  # Prevent infinite loop
-                job_seeker = random.choice(job_seekers)
-                job = random.choice(jobs)
-                combination = (job_seeker.id, job.id)
-                
-                if combination not in applied_combinations:
-                    applied_combinations.add(combination)
-                    break
-                attempts += 1
-            else:
-                continue  # Skip if we can't find a unique combination
-            
-            # Random application date within the last 30 days
-            applied_date = timezone.now() - timedelta(days=random.randint(0, 30))
-            
-            application = Application.objects.create(
+        # Draw distinct (job seeker, job) pairs from the flattened index space;
+        # there can't be more applications than pairs
+        num_jobs = len(jobs)
+        count = min(count, len(job_seekers) * num_jobs)
+        pairs = [
+            (job_seekers[i // num_jobs], jobs[i % num_jobs])
+            for i in random.sample(range(len(job_seekers) * num_jobs), k=count)
+        ]
+        
+        now = timezone.now()
+        fields = zip(
+            pairs,
+            random.choices(cover_letters, k=count),
+            random.choices(statuses, k=count),
+            # Application date within the last 30 days
+            random.choices(range(0, 31), k=count),
+        )
+        
+        for (job_seeker, job), cover_letter, status, days_ago in fields:
+            application = Application(
                 job=job,
                 applicant=job_seeker,
                 resume='resumes/sample_resume.pdf',  # Placeholder path
-                cover_letter=random.choice(cover_letters),
-                status=random.choice(statuses),
-                applied_date=applied_date
+                cover_letter=cover_letter,
+                status=status,
+                applied_date=now - timedelta(days=days_ago)
             )
             applications.append(application)
         
-        return applications
+        return Application.objects.bulk_create(applications, batch_size=BATCH_SIZE)
 
     def create_job_alerts(self, job_seekers):
         """Create sample job alerts for job seekers"""
@@ -274,15 +325,28 @@ class Command(BaseCommand):
         ]
         
         # Create 1-3 alerts per job seeker
-        for job_seeker in job_seekers:
-            num_alerts = random.randint(1, 3)
-            
-            for _ in range(num_alerts):
-                alert = JobAlert.objects.create(
-                    user=job_seeker,
-                    keyword=random.choice(keywords),
-                    location=random.choice(locations)
-                )
-                alerts.append(alert)
+        alert_counts = random.choices(range(1, 4), k=len(job_seekers))
+        owners = [
+            job_seeker
+            for job_seeker, num_alerts in zip(job_seekers, alert_counts)
+            for _ in range(num_alerts)
+        ]
+        fields = zip(
+            owners,
+            random.choices(keywords, k=len(owners)),
+            random.choices(locations, k=len(owners)),
+        )
+        
+        for job_seeker, keyword, location in fields:
+            alert = JobAlert(
+                user=job_seeker,
+                keyword=keyword,
+                location=location
+            )
+            alerts.append(alert)
+        
+        alerts = JobAlert.objects.bulk_create(alerts, batch_size=BATCH_SIZE)
         
+        # bulk_create skips the signal that keeps the alert count current
+        JobAlert.clear_count()
         return alerts
\ No newline at end of file
@@ -4,7 +4,11 @@ Management command to grant or revoke admin access for employer users
 
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
-from admin import grant_employer_admin_access, revoke_employer_admin_access
+from JobBoardPortal.accounts.mixins import check_user_type
+from admin import (
+    grant_employer_admin_access, revoke_employer_admin_access,
+    bulk_grant_employer_admin, bulk_revoke_employer_admin,
+)
 
 
 class Command(BaseCommand):
@@ -28,20 +32,20 @@ class Command(BaseCommand):
             # Apply to all employers
             employers = User.objects.filter(userprofile__user_type='employer')
             
-            if not employers.exists():
+            # One UPDATE and one group change for the whole set
+            if action == 'grant':
+                success_count = bulk_grant_employer_admin(employers)
+                message = 'Granted admin access to'
+            else:  # revoke
+                success_count = bulk_revoke_employer_admin(employers)
+                message = 'Revoked admin access from'
+            
+            if not success_count:
                 self.stdout.write(self.style.WARNING('No employers found in the system'))
                 return
             
-            success_count = 0
-            for employer in employers:
-                if action == 'grant':
-                    if grant_employer_admin_access(employer):
-                        success_count += 1
-                        self.stdout.write(f'Granted admin access to {employer.username}')
-                else:  # revoke
-                    if revoke_employer_admin_access(employer):
-                        success_count += 1
-                        self.stdout.write(f'Revoked admin access from {employer.username}')
+            for employer_username in employers.values_list('username', flat=True).iterator(chunk_size=1000):
+                self.stdout.write(f'{message} {employer_username}')
             
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully {action}ed admin access for {success_count} employers')
@@ -54,7 +58,7 @@ class Command(BaseCommand):
             except User.DoesNotExist:
                 raise CommandError(f'User "{username}" does not exist')
             
-            if not hasattr(user, 'userprofile') or user.userprofile.user_type != 'employer':
+            if check_user_type(user) != 'employer':
                 raise CommandError(f'User "{username}" is not an employer')
             
             if action == 'grant':
@@ -3,9 +3,8 @@ Management command to set up admin permissions for different user roles
 """
 
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import Group, Permission
-from django.contrib.contenttypes.models import ContentType
-from admin import setup_employer_permissions
+from django.contrib.auth.models import Group
+from admin import setup_employer_permissions, get_permissions
 
 
 class Command(BaseCommand):
@@ -43,16 +42,15 @@ class Command(BaseCommand):
                 ('jobs', 'application', 'view_application'),
             ]
             
-            for app_label, model, codename in permissions_to_add:
-                try:
-                    content_type = ContentType.objects.get(app_label=app_label, model=model)
-                    permission = Permission.objects.get(content_type=content_type, codename=codename)
-                    jobseeker_group.permissions.add(permission)
-                    self.stdout.write(f'Added permission: {codename}')
-                except (ContentType.DoesNotExist, Permission.DoesNotExist):
-                    self.stdout.write(
-                        self.style.WARNING(f'Permission {codename} not found, skipping...')
-                    )
+            permissions, missing = get_permissions(permissions_to_add)
+            jobseeker_group.permissions.add(*permissions)
+            
+            for permission in permissions:
+                self.stdout.write(f'Added permission: {permission.codename}')
+            for app_label, model, codename in missing:
+                self.stdout.write(
+                    self.style.WARNING(f'Permission {codename} not found, skipping...')
+                )
         
         self.stdout.write(
             self.style.SUCCESS('Successfully set up admin permissions for all user roles')
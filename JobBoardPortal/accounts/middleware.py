@@ -1,4 +1,24 @@
+import re
+
 from django.utils.deprecation import MiddlewareMixin
+from .mixins import check_user_type
+
+
+_JOB_PATH_RE = re.compile(r'^/jobs/(\d+)(?:/|$)')
+
+
+class UserProfileMiddleware(MiddlewareMixin):
+    """
+    Middleware to look up the user's type once per request, with a
+    single-column query, and expose it as request.user_type for permission
+    checks and navigation. It is not kept in the session, so a changed
+    profile takes effect on the next request.
+    """
+    
+    def process_request(self, request):
+        request.user_type = check_user_type(request.user)
+        
+        return None
 
 
 class LastVisitedJobMiddleware(MiddlewareMixin):
@@ -8,16 +28,20 @@ class LastVisitedJobMiddleware(MiddlewareMixin):
     
     def process_request(self, request):
         # Only track for authenticated users
-        if request.user.is_authenticated:
-            # Check if this is a job detail page (will be implemented when jobs app is created)
-            # For now, we'll set up the structure
-            if request.path.startswith('/jobs/') and request.path != '/jobs/':
-                # Extract job ID from URL pattern like /jobs/123/
-                path_parts = request.path.strip('/').split('/')
-                if len(path_parts) >= 2 and path_parts[1].isdigit():
-                    job_id = path_parts[1]
-                    request.session['last_visited_job_id'] = job_id
-                    request.session['last_visited_job_url'] = request.path
+        if not request.user.is_authenticated:
+            return None
+        
+        # Job pages look like /jobs/123/ (optionally followed by more segments)
+        match = _JOB_PATH_RE.match(request.path)
+        if not match:
+            return None
+        
+        job_id = match.group(1)
+        # Only touch the session when it changes, so revisits don't save it again
+        if (request.session.get('last_visited_job_id') != job_id or
+                request.session.get('last_visited_job_url') != request.path):
+            request.session['last_visited_job_id'] = job_id
+            request.session['last_visited_job_url'] = request.path
         
         return None
     
@@ -0,0 +1,20 @@
+# Case-insensitive unique index on auth_user.email
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        # Blank emails are excluded so users created without one (e.g. via
+        # createsuperuser) do not collide with each other.
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_lower_uniq ON auth_user (LOWER(email)) WHERE email <> '';",
+            reverse_sql="DROP INDEX auth_user_email_lower_uniq;",
+        ),
+    ]
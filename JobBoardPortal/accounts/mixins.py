@@ -2,6 +2,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect
 from django.contrib import messages
+from .models import UserProfile
 
 
 class EmployerRequiredMixin(LoginRequiredMixin):
@@ -16,7 +17,7 @@ class EmployerRequiredMixin(LoginRequiredMixin):
             return self.handle_no_permission()
         
         # Check if user has a profile and is an employer
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.user_type != 'employer':
+        if get_request_user_type(request) != 'employer':
             raise PermissionDenied("Access denied. Only employers can access this page.")
         
         return super().dispatch(request, *args, **kwargs)
@@ -34,7 +35,7 @@ class JobSeekerRequiredMixin(LoginRequiredMixin):
             return self.handle_no_permission()
         
         # Check if user has a profile and is a job seeker
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.user_type != 'jobseeker':
+        if get_request_user_type(request) != 'jobseeker':
             raise PermissionDenied("Access denied. Only job seekers can access this page.")
         
         return super().dispatch(request, *args, **kwargs)
@@ -49,7 +50,7 @@ def employer_required(view_func):
             messages.error(request, 'Please log in to access this page.')
             return redirect('accounts:login')
         
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.user_type != 'employer':
+        if get_request_user_type(request) != 'employer':
             raise PermissionDenied("Access denied. Only employers can access this page.")
         
         return view_func(request, *args, **kwargs)
@@ -66,7 +67,7 @@ def jobseeker_required(view_func):
             messages.error(request, 'Please log in to access this page.')
             return redirect('accounts:login')
         
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.user_type != 'jobseeker':
+        if get_request_user_type(request) != 'jobseeker':
             raise PermissionDenied("Access denied. Only job seekers can access this page.")
         
         return view_func(request, *args, **kwargs)
@@ -74,6 +75,16 @@ def jobseeker_required(view_func):
     return wrapper
 
 
+def get_request_user_type(request):
+    """
+    Return the user type cached on the request by UserProfileMiddleware,
+    falling back to the profile when the middleware hasn't run.
+    """
+    if hasattr(request, 'user_type'):
+        return request.user_type
+    return check_user_type(request.user)
+
+
 def check_user_type(user):
     """
     Utility function to check user type.
@@ -82,10 +93,13 @@ def check_user_type(user):
     if not user.is_authenticated:
         return None
     
-    if not hasattr(user, 'userprofile'):
-        return None
+    # Only the type column is needed, cached on the user for repeat checks
+    if not hasattr(user, '_cached_user_type'):
+        user._cached_user_type = UserProfile.objects.filter(
+            user_id=user.pk
+        ).values_list('user_type', flat=True).first()
     
-    return user.userprofile.user_type
+    return user._cached_user_type
 
 
 def is_employer(user):
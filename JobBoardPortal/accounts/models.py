@@ -1,9 +1,18 @@
+from contextlib import contextmanager
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 
+class UserProfileManager(models.Manager):
+    """Manager that joins the user, which __str__ and the admin always need"""
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
+
 class UserProfile(models.Model):
     USER_TYPE_CHOICES = [
         ('employer', 'Employer'),
@@ -16,23 +25,53 @@ class UserProfile(models.Model):
     location = models.CharField(max_length=100)
     profile_picture = models.ImageField(upload_to='profiles/', blank=True, null=True)
     
+    objects = UserProfileManager()
+    
     def __str__(self):
         return f"{self.user.username} - {self.get_user_type_display()}"
     
+    @classmethod
+    def bulk_create_for_users(cls, users, batch_size=1000):
+        """
+        Create blank profiles for many users with multi-row INSERTs.
+        Use for bulk imports, where the per-user post_save signal doesn't
+        fire (bulk_create) or is disabled with disable_profile_signal().
+        Users that already have a profile are skipped.
+        """
+        return cls.objects.bulk_create(
+            [cls(user=user) for user in users],
+            batch_size=batch_size,
+            ignore_conflicts=True
+        )
+    
     class Meta:
         verbose_name = "User Profile"
         verbose_name_plural = "User Profiles"
+        indexes = [
+            # Used by admin list_filter and search_fields
+            models.Index(fields=['user_type']),
+            models.Index(fields=['location']),
+        ]
 
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
-    """Create UserProfile when User is created"""
+    """
+    Create UserProfile when User is created. Profile changes are saved
+    by whoever makes them, so plain User updates don't touch the profile.
+    """
     if created:
         UserProfile.objects.create(user=instance)
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save UserProfile when User is saved"""
-    if hasattr(instance, 'userprofile'):
-        instance.userprofile.save()
\ No newline at end of file
+@contextmanager
+def disable_profile_signal():
+    """
+    Disconnect create_user_profile while importing users one by one,
+    so their profiles can be created afterwards with bulk_create_for_users()
+    """
+    post_save.disconnect(create_user_profile, sender=User)
+    try:
+        yield
+    finally:
+        post_save.connect(create_user_profile, sender=User)
@@ -3,9 +3,11 @@ from django.contrib.auth import login, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib import messages
+from django.core.exceptions import ValidationError
 from django.views.generic import TemplateView
 from django.utils.decorators import method_decorator
 from .forms import EmployerRegistrationForm, JobSeekerRegistrationForm, UserProfileForm
+from .mixins import check_user_type
 
 
 class CustomLoginView(LoginView):
@@ -13,9 +15,10 @@ class CustomLoginView(LoginView):
     template_name = 'accounts/login.html'
     
     def get_success_url(self):
-        # Redirect based on user type
-        if hasattr(self.request.user, 'userprofile'):
-            if self.request.user.userprofile.user_type == 'employer':
+        # Redirect based on the type of the user who just logged in
+        user_type = check_user_type(self.request.user)
+        if user_type is not None:
+            if user_type == 'employer':
                 return '/companies/profile/'  # Will be implemented in companies app
             else:
                 return '/jobs/'  # Will be implemented in jobs app
@@ -37,10 +40,13 @@ def employer_register(request):
     if request.method == 'POST':
         form = EmployerRegistrationForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            username = form.cleaned_data.get('username')
-            messages.success(request, f'Account created for {username}! You can now log in as an employer.')
-            return redirect('accounts:login')
+            try:
+                user = form.save()
+                username = form.cleaned_data.get('username')
+                messages.success(request, f'Account created for {username}! You can now log in as an employer.')
+                return redirect('accounts:login')
+            except ValidationError:
+                pass  # Error has been attached to the form
     else:
         form = EmployerRegistrationForm()
     
@@ -61,8 +67,8 @@ def jobseeker_register(request):
                 username = form.cleaned_data.get('username')
                 messages.success(request, f'Account created for {username}! You can now log in as a job seeker.')
                 return redirect('accounts:login')
-            except Exception as e:
-                messages.error(request, f'Error creating account: {str(e)}')
+            except ValidationError:
+                pass  # Error has been attached to the form
         else:
             messages.error(request, 'Please correct the errors below.')
     else:
@@ -83,9 +89,12 @@ def profile_view(request):
     if request.method == 'POST':
         form = UserProfileForm(request.POST, request.FILES, instance=user_profile)
         if form.is_valid():
-            form.save()
-            messages.success(request, 'Your profile has been updated successfully!')
-            return redirect('accounts:profile')
+            try:
+                form.save()
+                messages.success(request, 'Your profile has been updated successfully!')
+                return redirect('accounts:profile')
+            except ValidationError:
+                pass  # Error has been attached to the form
     else:
         form = UserProfileForm(instance=user_profile)
     
@@ -5,13 +5,28 @@ Handles role-based access control and permissions
 
 from django.contrib import admin
 from django.contrib.auth.models import User, Group, Permission
-from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 from django.contrib.admin import AdminSite
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
+from JobBoardPortal.accounts.mixins import check_user_type, get_request_user_type
+from JobBoardPortal.companies.models import Company
+from JobBoardPortal.jobs.models import Job, Application
+
+
+# Any one of these lets an employer into the admin site
+EMPLOYER_ADMIN_VIEW_PERMISSIONS = frozenset({
+    'companies.view_company',
+    'jobs.view_job',
+    'jobs.view_application',
+})
+
 
 class JobBoardAdminSite(AdminSite):
     """Custom admin site with role-based access control"""
@@ -37,12 +52,9 @@ class JobBoardAdminSite(AdminSite):
             return True
         
         # Employers with admin permissions have limited access
-        if hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer':
-                # Check if employer has been granted admin permissions
-                return request.user.has_perm('companies.view_company') or \
-                       request.user.has_perm('jobs.view_job') or \
-                       request.user.has_perm('jobs.view_application')
+        if get_request_user_type(request) == 'employer':
+            # Check if employer has been granted any of the admin view permissions
+            return not EMPLOYER_ADMIN_VIEW_PERMISSIONS.isdisjoint(request.user.get_all_permissions())
         
         return False
     
@@ -52,26 +64,30 @@ class JobBoardAdminSite(AdminSite):
         """
         extra_context = extra_context or {}
         
-        if hasattr(request.user, 'userprofile'):
-            user_type = request.user.userprofile.user_type
+        user_type = get_request_user_type(request)
+        if user_type:
             extra_context['user_type'] = user_type
             
             if user_type == 'employer':
                 # Add employer-specific context
-                from JobBoardPortal.companies.models import Company
-                from JobBoardPortal.jobs.models import Job, Application
-                
                 try:
-                    company = Company.objects.get(user=request.user)
-                    jobs = Job.objects.filter(company=company)
-                    applications = Application.objects.filter(job__company=company)
+                    company = Company.objects.only('id', 'name', 'user_id').get(user=request.user)
+                    # One aggregate query each for jobs and applications
+                    job_stats = Job.objects.filter(company=company).aggregate(
+                        total=Count('id'),
+                        active=Count('id', filter=Q(deadline__gt=timezone.localdate())),
+                    )
+                    application_stats = Application.objects.filter(job__company=company).aggregate(
+                        total=Count('id'),
+                        pending=Count('id', filter=Q(status='applied')),
+                    )
                     
                     extra_context.update({
                         'company': company,
-                        'total_jobs': jobs.count(),
-                        'active_jobs': jobs.filter(deadline__gt=timezone.now().date()).count(),
-                        'total_applications': applications.count(),
-                        'pending_applications': applications.filter(status='applied').count(),
+                        'total_jobs': job_stats['total'],
+                        'active_jobs': job_stats['active'],
+                        'total_applications': application_stats['total'],
+                        'pending_applications': application_stats['pending'],
                     })
                 except Company.DoesNotExist:
                     extra_context['no_company'] = True
@@ -83,6 +99,25 @@ class JobBoardAdminSite(AdminSite):
 job_board_admin = JobBoardAdminSite(name='job_board_admin')
 
 
+def get_permissions(permissions_to_add):
+    """
+    Fetch (app_label, model, codename) permissions in a single query
+    Returns the found permissions and the missing triples
+    """
+    wanted = set(permissions_to_add)
+    candidates = Permission.objects.select_related('content_type').filter(
+        codename__in=[codename for _, _, codename in permissions_to_add]
+    )
+    permissions = []
+    for permission in candidates:
+        key = (permission.content_type.app_label, permission.content_type.model, permission.codename)
+        if key in wanted:
+            permissions.append(permission)
+            wanted.discard(key)
+    missing = [triple for triple in permissions_to_add if triple in wanted]
+    return permissions, missing
+
+
 def setup_employer_permissions():
     """
     Set up permissions for employer users to access admin
@@ -111,27 +146,50 @@ def setup_employer_permissions():
             ('jobs', 'application', 'change_application'),
         ]
         
-        for app_label, model, codename in permissions_to_add:
-            try:
-                content_type = ContentType.objects.get(app_label=app_label, model=model)
-                permission = Permission.objects.get(content_type=content_type, codename=codename)
-                employer_group.permissions.add(permission)
-            except (ContentType.DoesNotExist, Permission.DoesNotExist):
-                pass  # Permission doesn't exist yet, will be created during migration
+        # Missing permissions don't exist yet, they will be created during migration
+        permissions, missing = get_permissions(permissions_to_add)
+        employer_group.permissions.add(*permissions)
+
+
+# Employers group, cached for the life of the process
+_employer_group_cache = {}
+
+
+def get_employer_group(create=True):
+    """
+    Return the Employers group, creating it unless create is False
+    The group is only cached outside transactions, so a row that may still
+    be rolled back is never remembered
+    """
+    employer_group = _employer_group_cache.get('group')
+    if employer_group is None:
+        if create:
+            employer_group, created = Group.objects.get_or_create(name='Employers')
+        else:
+            employer_group = Group.objects.filter(name='Employers').first()
+        if employer_group and not transaction.get_connection().in_atomic_block:
+            _employer_group_cache['group'] = employer_group
+    return employer_group
+
+
+@receiver(post_delete, sender=Group)
+def clear_employer_group_cache(sender, instance, **kwargs):
+    """Forget the cached Employers group when it is deleted"""
+    if instance.name == 'Employers':
+        _employer_group_cache.clear()
 
 
 def grant_employer_admin_access(user):
     """
     Grant admin access to an employer user
     """
-    if hasattr(user, 'userprofile') and user.userprofile.user_type == 'employer':
+    if check_user_type(user) == 'employer':
         # Make user staff so they can access admin
         user.is_staff = True
-        user.save()
+        user.save(update_fields=['is_staff'])
         
         # Add to employer group
-        employer_group, created = Group.objects.get_or_create(name='Employers')
-        user.groups.add(employer_group)
+        user.groups.add(get_employer_group())
         
         return True
     return False
@@ -141,17 +199,49 @@ def revoke_employer_admin_access(user):
     """
     Revoke admin access from an employer user
     """
-    if hasattr(user, 'userprofile') and user.userprofile.user_type == 'employer':
+    if check_user_type(user) == 'employer':
         # Remove staff status
         user.is_staff = False
-        user.save()
+        user.save(update_fields=['is_staff'])
         
         # Remove from employer group
-        try:
-            employer_group = Group.objects.get(name='Employers')
+        employer_group = get_employer_group(create=False)
+        if employer_group:
             user.groups.remove(employer_group)
-        except Group.DoesNotExist:
-            pass
         
         return True
-    return False
\ No newline at end of file
+    return False
+
+
+def bulk_grant_employer_admin(queryset):
+    """
+    Grant admin access to every employer in queryset
+    Returns the number of employers updated
+    """
+    user_ids = list(queryset.filter(userprofile__user_type='employer').values_list('pk', flat=True))
+    if not user_ids:
+        return 0
+    
+    with transaction.atomic():
+        User.objects.filter(pk__in=user_ids).update(is_staff=True)
+        get_employer_group().user_set.add(*user_ids)
+    
+    return len(user_ids)
+
+
+def bulk_revoke_employer_admin(queryset):
+    """
+    Revoke admin access from every employer in queryset
+    Returns the number of employers updated
+    """
+    user_ids = list(queryset.filter(userprofile__user_type='employer').values_list('pk', flat=True))
+    if not user_ids:
+        return 0
+    
+    with transaction.atomic():
+        User.objects.filter(pk__in=user_ids).update(is_staff=False)
+        employer_group = get_employer_group(create=False)
+        if employer_group:
+            employer_group.user_set.remove(*user_ids)
+    
+    return len(user_ids)
@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from JobBoardPortal.accounts.mixins import get_request_user_type
 from .models import Company
 
 
@@ -52,8 +54,11 @@ class CompanyAdmin(admin.ModelAdmin):
     
     def get_job_count(self, obj):
         """Get number of jobs posted by this company"""
+        if hasattr(obj, 'job_count'):
+            return obj.job_count
         return obj.jobs.count()
     get_job_count.short_description = 'Total Jobs'
+    get_job_count.admin_order_field = 'job_count'
     
     def get_logo_preview(self, obj):
         """Display logo preview in admin"""
@@ -63,28 +68,27 @@ class CompanyAdmin(admin.ModelAdmin):
     get_logo_preview.short_description = 'Logo Preview'
     
     def get_queryset(self, request):
-        """Optimize queryset with select_related and prefetch_related"""
-        return super().get_queryset(request).select_related('user', 'user__userprofile').prefetch_related('jobs')
+        """Optimize queryset with select_related and a job count annotation"""
+        return super().get_queryset(request).select_related('user', 'user__userprofile').annotate(
+            job_count=Count('jobs')
+        )
     
     def has_view_permission(self, request, obj=None):
         """Allow employers to view their own company profiles"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.user_id:
+            return True
         return super().has_view_permission(request, obj)
     
     def has_change_permission(self, request, obj=None):
         """Allow employers to edit their own company profiles"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.user_id:
+            return True
         return super().has_change_permission(request, obj)
     
     def has_delete_permission(self, request, obj=None):
         """Allow employers to delete their own company profiles"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.user_id:
+            return True
         return super().has_delete_permission(request, obj)
     
     def get_form(self, request, obj=None, **kwargs):
@@ -92,7 +96,7 @@ class CompanyAdmin(admin.ModelAdmin):
         form = super().get_form(request, obj, **kwargs)
         
         # If user is an employer (not superuser), limit user field to themselves
-        if hasattr(request.user, 'userprofile') and request.user.userprofile.user_type == 'employer':
+        if get_request_user_type(request) == 'employer':
             if not request.user.is_superuser:
                 form.base_fields['user'].queryset = form.base_fields['user'].queryset.filter(pk=request.user.pk)
                 form.base_fields['user'].initial = request.user
@@ -2,7 +2,10 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from .models import Company
-import os
+
+
+# Accepted logo extensions, normalized once for set lookups
+_ALLOWED_IMAGE_EXTS = frozenset(e.lower() for e in settings.ALLOWED_IMAGE_EXTENSIONS)
 
 
 class CompanyProfileForm(forms.ModelForm):
@@ -39,8 +42,8 @@ class CompanyProfileForm(forms.ModelForm):
         
         if logo:
             # Check file extension
-            ext = os.path.splitext(logo.name)[1].lower()
-            if ext not in settings.ALLOWED_IMAGE_EXTENSIONS:
+            ext = '.' + logo.name.rpartition('.')[2].lower()
+            if ext not in _ALLOWED_IMAGE_EXTS:
                 raise ValidationError(
                     f'Invalid file type. Allowed formats: {", ".join(settings.ALLOWED_IMAGE_EXTENSIONS)}'
                 )
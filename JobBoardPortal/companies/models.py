@@ -5,6 +5,16 @@ from django.conf import settings
 import os
 
 
+# Leading bytes of each accepted image format, with the extensions it may use
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', ('.png',)),
+    (b'\xff\xd8\xff', ('.jpg', '.jpeg')),
+    (b'GIF87a', ('.gif',)),
+    (b'GIF89a', ('.gif',)),
+    (b'BM', ('.bmp',)),
+)
+
+
 def validate_image_file(file):
     """Validate that uploaded file is an image with allowed extension"""
     if not file:
@@ -22,6 +32,16 @@ def validate_image_file(file):
         raise ValidationError(
             f'File size too large. Maximum size allowed: {settings.MAX_UPLOAD_SIZE / (1024*1024):.1f}MB'
         )
+    
+    # Check the content matches the extension; files already in storage
+    # were checked when they were uploaded
+    if not getattr(file, '_committed', False):
+        file.seek(0)
+        head = file.read(8)
+        file.seek(0)
+        if not any(head.startswith(signature) and ext in extensions
+                   for signature, extensions in _IMAGE_SIGNATURES):
+            raise ValidationError('File content does not match a valid image of that type.')
 
 
 class Company(models.Model):
@@ -43,9 +63,28 @@ class Company(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Owner as last loaded or saved, so clean() can skip re-checking it
+    _orig_user_id = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Read from __dict__ so a deferred user_id isn't fetched here
+        instance._orig_user_id = instance.__dict__.get('user_id')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._orig_user_id = self.__dict__.get('user_id')
+    
     def __str__(self):
         return self.name
     
+    @classmethod
+    def get_id_for_user(cls, user_id):
+        """Id of the user's company, or None, without loading the row"""
+        return cls.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+    
     class Meta:
         verbose_name = "Company"
         verbose_name_plural = "Companies"
@@ -55,10 +94,14 @@ class Company(models.Model):
         """Custom validation for Company model"""
         super().clean()
         
+        # The owner was already validated when it was set
+        if self.pk and self._orig_user_id == self.user_id:
+            return
+        
         # Ensure user is an employer (only if user is set)
         if hasattr(self, 'user') and self.user:
             if hasattr(self.user, 'userprofile'):
                 if self.user.userprofile.user_type != 'employer':
                     raise ValidationError('Only employers can create company profiles.')
             else:
-                raise ValidationError('User must have a profile to create a company.')
\ No newline at end of file
+                raise ValidationError('User must have a profile to create a company.')
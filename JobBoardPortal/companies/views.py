@@ -6,57 +6,53 @@ from django.utils.decorators import method_decorator
 from django.views.generic import View
 from .models import Company
 from .forms import CompanyProfileForm
-from JobBoardPortal.accounts.mixins import EmployerRequiredMixin
+from JobBoardPortal.accounts.mixins import EmployerRequiredMixin, get_request_user_type
 
 
 @method_decorator(login_required, name='dispatch')
 class CompanyProfileView(EmployerRequiredMixin, View):
     """View for managing company profile"""
     
+    def _get_company(self, user):
+        """Return the user's company with its user joined in, or None"""
+        return Company.objects.select_related('user').filter(user=user).first()
+    
     def get(self, request):
         """Display company profile form"""
         # Double-check user type (should be handled by mixin, but extra safety)
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.user_type != 'employer':
+        if get_request_user_type(request) != 'employer':
             messages.error(request, 'Access denied. Only employers can manage company profiles.')
             return redirect('accounts:profile')
         
-        try:
-            company = Company.objects.get(user=request.user)
-            form = CompanyProfileForm(instance=company)
-            context = {
-                'form': form,
-                'company': company,
-                'is_edit': True
-            }
-        except Company.DoesNotExist:
-            form = CompanyProfileForm()
-            context = {
-                'form': form,
-                'company': None,
-                'is_edit': False
-            }
+        company = self._get_company(request.user)
+        context = {
+            'form': CompanyProfileForm(instance=company),
+            'company': company,
+            'is_edit': company is not None
+        }
         
         return render(request, 'companies/profile.html', context)
     
     def post(self, request):
         """Handle company profile form submission"""
         # Double-check user type (should be handled by mixin, but extra safety)
-        if not hasattr(request.user, 'userprofile') or request.user.userprofile.user_type != 'employer':
+        if get_request_user_type(request) != 'employer':
             messages.error(request, 'Access denied. Only employers can manage company profiles.')
             return redirect('accounts:profile')
         
-        try:
-            company = Company.objects.get(user=request.user)
-            form = CompanyProfileForm(request.POST, request.FILES, instance=company)
-            is_edit = True
-        except Company.DoesNotExist:
-            form = CompanyProfileForm(request.POST, request.FILES)
-            is_edit = False
+        company = self._get_company(request.user)
+        form = CompanyProfileForm(request.POST, request.FILES, instance=company)
+        is_edit = company is not None
         
         if form.is_valid():
             company = form.save(commit=False)
-            company.user = request.user
-            company.save()
+            if is_edit:
+                # Only write the columns the user actually changed
+                if form.has_changed():
+                    company.save(update_fields=[*form.changed_data, 'updated_at'])
+            else:
+                company.user = request.user
+                company.save()
             
             if is_edit:
                 messages.success(request, 'Company profile updated successfully!')
@@ -1,11 +1,19 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
-from django.db.models import Count
+from django.db.models import BooleanField, Case, Count, DateField, DurationField, ExpressionWrapper, F, Value, When
 from django.utils import timezone
+from JobBoardPortal.accounts.mixins import get_request_user_type
 from .models import Job, Application, JobAlert
 
 
+def _is_changelist(request, model_admin):
+    """Check whether the request is for the model's changelist page"""
+    match = getattr(request, 'resolver_match', None)
+    opts = model_admin.model._meta
+    return match is not None and match.url_name == f'{opts.app_label}_{opts.model_name}_changelist'
+
+
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ['title', 'get_company_link', 'get_employer', 'location', 'salary', 'get_application_count', 'posted_date', 'deadline', 'is_active']
@@ -14,6 +22,7 @@ class JobAdmin(admin.ModelAdmin):
     readonly_fields = ['posted_date', 'created_at', 'updated_at', 'get_application_count', 'get_days_remaining']
     date_hierarchy = 'posted_date'
     list_per_page = 25
+    show_full_result_count = False
     
     fieldsets = (
         ('Job Information', {
@@ -47,13 +56,19 @@ class JobAdmin(admin.ModelAdmin):
     
     def get_application_count(self, obj):
         """Get number of applications for this job"""
+        if hasattr(obj, 'application_count'):
+            return obj.application_count
         return obj.applications.count()
     get_application_count.short_description = 'Applications'
+    get_application_count.admin_order_field = 'application_count'
     
     def get_days_remaining(self, obj):
         """Get days remaining until deadline"""
         if obj.deadline:
-            days = obj.days_until_deadline
+            if hasattr(obj, '_days_remaining'):
+                days = obj._days_remaining.days
+            else:
+                days = obj.days_until_deadline
             if days > 0:
                 return f"{days} days"
             elif days == 0:
@@ -64,16 +79,38 @@ class JobAdmin(admin.ModelAdmin):
     get_days_remaining.short_description = 'Days Remaining'
     
     def is_active(self, obj):
+        if hasattr(obj, '_is_active'):
+            return obj._is_active
         return obj.is_active
     is_active.boolean = True
     is_active.short_description = 'Active'
+    is_active.admin_order_field = '_is_active'
     
     def get_queryset(self, request):
         """Optimize queryset and filter for employers"""
-        qs = super().get_queryset(request).select_related('company', 'company__user').prefetch_related('applications')
+        # The company is joined for the ownership checks in has_*_permission,
+        # and its user for the employer column
+        # Deadline state is computed in the SELECT against a single "today"
+        today = Value(timezone.localdate(), output_field=DateField())
+        qs = super().get_queryset(request).select_related('company__user').annotate(
+            application_count=Count('applications'),
+            _days_remaining=ExpressionWrapper(F('deadline') - today, output_field=DurationField()),
+            _is_active=Case(
+                When(deadline__gt=today, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+        
+        # The changelist never shows description/requirements, so skip the TEXT columns
+        if _is_changelist(request, self):
+            qs = qs.only(
+                'id', 'title', 'location', 'salary', 'posted_date', 'deadline',
+                'company__id', 'company__name', 'company__user__id', 'company__user__username',
+            )
         
         # If user is an employer, show only their jobs
-        if hasattr(request.user, 'userprofile') and request.user.userprofile.user_type == 'employer':
+        if get_request_user_type(request) == 'employer':
             if not request.user.is_superuser:
                 qs = qs.filter(company__user=request.user)
         
@@ -81,23 +118,20 @@ class JobAdmin(admin.ModelAdmin):
     
     def has_view_permission(self, request, obj=None):
         """Allow employers to view their own jobs"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.company.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.company.user_id:
+            return True
         return super().has_view_permission(request, obj)
     
     def has_change_permission(self, request, obj=None):
         """Allow employers to edit their own jobs"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.company.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.company.user_id:
+            return True
         return super().has_change_permission(request, obj)
     
     def has_delete_permission(self, request, obj=None):
         """Allow employers to delete their own jobs"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.company.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.company.user_id:
+            return True
         return super().has_delete_permission(request, obj)
     
     def get_form(self, request, obj=None, **kwargs):
@@ -105,13 +139,25 @@ class JobAdmin(admin.ModelAdmin):
         form = super().get_form(request, obj, **kwargs)
         
         # If user is an employer, limit company field to their companies
-        if hasattr(request.user, 'userprofile') and request.user.userprofile.user_type == 'employer':
+        if get_request_user_type(request) == 'employer':
             if not request.user.is_superuser:
                 form.base_fields['company'].queryset = form.base_fields['company'].queryset.filter(user=request.user)
         
         return form
 
 
+def _status_action(status):
+    """Build an admin action that sets the selected applications' status"""
+    label = dict(Application.STATUS_CHOICES)[status]
+    
+    def action(modeladmin, request, queryset):
+        updated = queryset.update(status=status)
+        modeladmin.message_user(request, f'{updated} applications marked as {label}.')
+    action.__name__ = f'mark_{status}'
+    action.short_description = f"Mark selected applications as {label}"
+    return action
+
+
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ['get_applicant_link', 'get_applicant_email', 'get_job_link', 'get_company', 'status', 'applied_date', 'get_resume_link']
@@ -120,6 +166,7 @@ class ApplicationAdmin(admin.ModelAdmin):
     readonly_fields = ['applied_date', 'get_resume_link']
     date_hierarchy = 'applied_date'
     list_per_page = 25
+    show_full_result_count = False
     actions = ['mark_under_review', 'mark_shortlisted', 'mark_rejected']
     
     fieldsets = (
@@ -168,10 +215,20 @@ class ApplicationAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         """Optimize queryset and filter for employers"""
-        qs = super().get_queryset(request).select_related('job', 'job__company', 'applicant', 'applicant__userprofile')
+        # The job's company is joined for the ownership checks in has_*_permission,
+        # and the applicant for the changelist columns
+        qs = super().get_queryset(request).select_related('job__company', 'applicant')
+        
+        # The changelist never shows the cover letter, so skip the TEXT column
+        if _is_changelist(request, self):
+            qs = qs.only(
+                'id', 'status', 'applied_date', 'resume',
+                'job__id', 'job__title', 'job__company__id', 'job__company__name',
+                'applicant__id', 'applicant__username', 'applicant__email',
+            )
         
         # If user is an employer, show only applications for their jobs
-        if hasattr(request.user, 'userprofile') and request.user.userprofile.user_type == 'employer':
+        if get_request_user_type(request) == 'employer':
             if not request.user.is_superuser:
                 qs = qs.filter(job__company__user=request.user)
         
@@ -179,16 +236,14 @@ class ApplicationAdmin(admin.ModelAdmin):
     
     def has_view_permission(self, request, obj=None):
         """Allow employers to view applications for their jobs"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.job.company.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.job.company.user_id:
+            return True
         return super().has_view_permission(request, obj)
     
     def has_change_permission(self, request, obj=None):
         """Allow employers to change application status for their jobs"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'employer' and request.user == obj.job.company.user:
-                return True
+        if obj and get_request_user_type(request) == 'employer' and request.user.id == obj.job.company.user_id:
+            return True
         return super().has_change_permission(request, obj)
     
     def has_delete_permission(self, request, obj=None):
@@ -200,7 +255,7 @@ class ApplicationAdmin(admin.ModelAdmin):
         form = super().get_form(request, obj, **kwargs)
         
         # If user is an employer, limit job field to their jobs and make applicant readonly
-        if hasattr(request.user, 'userprofile') and request.user.userprofile.user_type == 'employer':
+        if get_request_user_type(request) == 'employer':
             if not request.user.is_superuser:
                 form.base_fields['job'].queryset = form.base_fields['job'].queryset.filter(company__user=request.user)
                 if obj:  # Editing existing application
@@ -210,20 +265,9 @@ class ApplicationAdmin(admin.ModelAdmin):
         return form
     
     # Admin actions for bulk status updates
-    def mark_under_review(self, request, queryset):
-        updated = queryset.update(status='under_review')
-        self.message_user(request, f'{updated} applications marked as Under Review.')
-    mark_under_review.short_description = "Mark selected applications as Under Review"
-    
-    def mark_shortlisted(self, request, queryset):
-        updated = queryset.update(status='shortlisted')
-        self.message_user(request, f'{updated} applications marked as Shortlisted.')
-    mark_shortlisted.short_description = "Mark selected applications as Shortlisted"
-    
-    def mark_rejected(self, request, queryset):
-        updated = queryset.update(status='rejected')
-        self.message_user(request, f'{updated} applications marked as Rejected.')
-    mark_rejected.short_description = "Mark selected applications as Rejected"
+    mark_under_review = _status_action('under_review')
+    mark_shortlisted = _status_action('shortlisted')
+    mark_rejected = _status_action('rejected')
 
 
 @admin.register(JobAlert)
@@ -234,6 +278,7 @@ class JobAlertAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at']
     date_hierarchy = 'created_at'
     list_per_page = 25
+    show_full_result_count = False
     
     def get_user_link(self, obj):
         """Get user username with link to user admin"""
@@ -253,21 +298,18 @@ class JobAlertAdmin(admin.ModelAdmin):
     
     def has_view_permission(self, request, obj=None):
         """Allow job seekers to view their own alerts"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'jobseeker' and request.user == obj.user:
-                return True
+        if obj and get_request_user_type(request) == 'jobseeker' and request.user.id == obj.user_id:
+            return True
         return super().has_view_permission(request, obj)
     
     def has_change_permission(self, request, obj=None):
         """Allow job seekers to edit their own alerts"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'jobseeker' and request.user == obj.user:
-                return True
+        if obj and get_request_user_type(request) == 'jobseeker' and request.user.id == obj.user_id:
+            return True
         return super().has_change_permission(request, obj)
     
     def has_delete_permission(self, request, obj=None):
         """Allow job seekers to delete their own alerts"""
-        if obj and hasattr(request.user, 'userprofile'):
-            if request.user.userprofile.user_type == 'jobseeker' and request.user == obj.user:
-                return True
+        if obj and get_request_user_type(request) == 'jobseeker' and request.user.id == obj.user_id:
+            return True
         return super().has_delete_permission(request, obj)
@@ -1,3 +1,4 @@
+from JobBoardPortal.accounts.mixins import get_request_user_type
 from .models import JobAlertNotification
 
 
@@ -11,11 +12,8 @@ def notifications_context(request):
     
     if request.user.is_authenticated:
         try:
-            if hasattr(request.user, 'userprofile') and request.user.userprofile.user_type == 'jobseeker':
-                context['unread_notifications_count'] = JobAlertNotification.objects.filter(
-                    user=request.user,
-                    is_read=False
-                ).count()
+            if get_request_user_type(request) == 'jobseeker':
+                context['unread_notifications_count'] = JobAlertNotification.get_unread_count(request.user.id)
         except Exception:
             # If there's any error, just return 0 count
             pass
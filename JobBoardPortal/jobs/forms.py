@@ -5,6 +5,16 @@ from django.conf import settings
 from .models import Job, Application, JobAlert
 import os
 import re
+from datetime import timedelta
+
+
+# Validation patterns, compiled once at import time
+_SPAM_RE = re.compile(r'\b(spam|scam|fake)\b')
+_FILENAME_RE = re.compile(r'^[a-zA-Z0-9._\-\s]+$')
+_KEYWORD_RE = re.compile(r'^[a-zA-Z0-9\s\-\+\#\.]+$')
+
+# Latest allowed job deadline, relative to today (about 2 years)
+_MAX_DEADLINE_DELTA = timedelta(days=730)
 
 
 class JobForm(forms.ModelForm):
@@ -66,11 +76,11 @@ class JobForm(forms.ModelForm):
     def clean_deadline(self):
         deadline = self.cleaned_data.get('deadline')
         if deadline:
-            if deadline <= timezone.now().date():
+            today = timezone.localdate()
+            if deadline <= today:
                 raise ValidationError('Job deadline must be in the future.')
             # Check if deadline is not too far in the future (e.g., 2 years)
-            max_deadline = timezone.now().date().replace(year=timezone.now().year + 2)
-            if deadline > max_deadline:
+            if deadline - today > _MAX_DEADLINE_DELTA:
                 raise ValidationError('Job deadline cannot be more than 2 years in the future.')
         return deadline
     
@@ -92,7 +102,7 @@ class JobForm(forms.ModelForm):
             if len(title) > 200:
                 raise ValidationError('Job title cannot exceed 200 characters.')
             # Check for inappropriate content (basic check)
-            if re.search(r'\b(spam|scam|fake)\b', title.lower()):
+            if _SPAM_RE.search(title.lower()):
                 raise ValidationError('Job title contains inappropriate content.')
         return title
     
@@ -162,9 +172,16 @@ class ApplicationForm(forms.ModelForm):
             )
         
         # Basic filename validation
-        if not re.match(r'^[a-zA-Z0-9._\-\s]+$', resume.name):
+        if not _FILENAME_RE.match(resume.name):
             raise ValidationError('Filename contains invalid characters. Use only letters, numbers, spaces, dots, hyphens, and underscores.')
         
+        # Check the PDF signature instead of trusting the extension
+        resume.seek(0)
+        header = resume.read(5)
+        resume.seek(0)
+        if header != b'%PDF-':
+            raise ValidationError('Invalid file content. Please upload a valid PDF document.')
+        
         return resume
     
     def clean_cover_letter(self):
@@ -210,7 +227,7 @@ class JobAlertForm(forms.ModelForm):
             if len(keyword) > 100:
                 raise ValidationError('Keyword cannot exceed 100 characters.')
             # Basic validation for meaningful keywords
-            if not re.match(r'^[a-zA-Z0-9\s\-\+\#\.]+$', keyword):
+            if not _KEYWORD_RE.match(keyword):
                 raise ValidationError('Keyword contains invalid characters. Use only letters, numbers, spaces, and common symbols.')
         return keyword
     
@@ -262,7 +279,7 @@ class JobSearchForm(forms.Form):
         keyword = self.cleaned_data.get('keyword')
         if keyword:
             keyword = keyword.strip()
-            if keyword and not re.match(r'^[a-zA-Z0-9\s\-\+\#\.]+$', keyword):
+            if keyword and not _KEYWORD_RE.match(keyword):
                 raise ValidationError('Search keyword contains invalid characters.')
         return keyword
     
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_alter_jobalertnotification_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status'], name='jobs_applic_status_f83260_idx'),
+        ),
+    ]
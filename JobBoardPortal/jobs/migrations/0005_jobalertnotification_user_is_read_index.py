@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_application_status_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobalertnotification',
+            index=models.Index(fields=['user', 'is_read'], name='jobs_jobale_user_id_6ed3ec_idx'),
+        ),
+    ]
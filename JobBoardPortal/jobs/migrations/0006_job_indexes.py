@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_jobalertnotification_user_is_read_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-posted_date'], name='jobs_job_posted__bd758d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['deadline', 'posted_date'], name='jobs_job_deadlin_a291ec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location'], name='jobs_job_locatio_8b2f8c_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', '-applied_date'], name='jobs_applic_applica_ba6355_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status'], name='jobs_applic_job_id_a25382_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobalertnotification',
+            index=models.Index(fields=['user', '-created_at'], name='jobs_jobale_user_id_16d2d7_idx'),
+        ),
+    ]
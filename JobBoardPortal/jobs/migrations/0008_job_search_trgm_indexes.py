@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+# Trigram indexes let PostgreSQL serve the job search's icontains filters
+# from an index. Other backends have no equivalent, so they are skipped.
+TRGM_INDEXES = [
+    ('jobs_job_title_trgm', 'title'),
+    ('jobs_job_description_trgm', 'description'),
+    ('jobs_job_requirements_trgm', 'requirements'),
+]
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRGM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON jobs_job USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in TRGM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_application_notification_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from JobBoardPortal.companies.models import Company
 import os
@@ -24,6 +25,15 @@ def validate_pdf_file(file):
         raise ValidationError(
             f'File size too large. Maximum size allowed: {settings.MAX_UPLOAD_SIZE / (1024*1024):.1f}MB'
         )
+    
+    # Check the PDF signature; files already in storage were checked
+    # when they were uploaded
+    if not getattr(file, '_committed', False):
+        file.seek(0)
+        head = file.read(5)
+        file.seek(0)
+        if head != b'%PDF-':
+            raise ValidationError('File content is not a valid PDF document.')
 
 
 class Job(models.Model):
@@ -38,6 +48,10 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Seconds the listing state behind the public pages' ETag may be reused
+    LISTING_STATE_CACHE_TIMEOUT = 30
+    LISTING_STATE_CACHE_KEY = 'jobs:listing_state'
+    
     def __str__(self):
         return f"{self.title} at {self.company.name}"
     
@@ -45,25 +59,53 @@ class Job(models.Model):
         verbose_name = "Job"
         verbose_name_plural = "Jobs"
         ordering = ['-posted_date']
+        indexes = [
+            # Default ordering, plus the admin's date/location filters
+            models.Index(fields=['-posted_date']),
+            models.Index(fields=['deadline', 'posted_date']),
+            models.Index(fields=['location']),
+        ]
     
     def clean(self):
         """Custom validation for Job model"""
         super().clean()
         
         # Ensure deadline is in the future
-        if self.deadline and self.deadline <= timezone.now().date():
+        if self.deadline and self.deadline <= timezone.localdate():
             raise ValidationError('Job deadline must be in the future.')
     
+    @classmethod
+    def get_listing_state(cls):
+        """
+        Last update time of the jobs and of their companies (whose names the
+        listing shows), plus the number of jobs, cached between requests
+        """
+        state = cache.get(cls.LISTING_STATE_CACHE_KEY)
+        if state is None:
+            stats = cls.objects.aggregate(
+                last_updated=models.Max('updated_at'),
+                company_last_updated=models.Max('company__updated_at'),
+                total=models.Count('id'),
+            )
+            state = f"{stats['last_updated']}|{stats['company_last_updated']}|{stats['total']}"
+            cache.set(cls.LISTING_STATE_CACHE_KEY, state, cls.LISTING_STATE_CACHE_TIMEOUT)
+        return state
+    
+    @classmethod
+    def clear_listing_state(cls):
+        """Drop the cached listing state after a job changes"""
+        cache.delete(cls.LISTING_STATE_CACHE_KEY)
+    
     @property
     def is_active(self):
         """Check if job is still active (deadline not passed)"""
-        return self.deadline > timezone.now().date()
+        return self.deadline > timezone.localdate()
     
     @property
     def days_until_deadline(self):
         """Calculate days remaining until deadline"""
         if self.deadline:
-            delta = self.deadline - timezone.now().date()
+            delta = self.deadline - timezone.localdate()
             return delta.days if delta.days > 0 else 0
         return 0
 
@@ -91,6 +133,14 @@ class Application(models.Model):
         verbose_name_plural = "Applications"
         ordering = ['-applied_date']
         unique_together = ['job', 'applicant']  # Prevent duplicate applications
+        indexes = [
+            # Used by the pending-application counts on the dashboards
+            models.Index(fields=['status']),
+            # A job seeker's applications, newest first
+            models.Index(fields=['applicant', '-applied_date']),
+            # Per-job status breakdowns for employers
+            models.Index(fields=['job', 'status']),
+        ]
     
     def clean(self):
         """Custom validation for Application model"""
@@ -110,9 +160,32 @@ class JobAlert(models.Model):
     location = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Seconds the total alert count may be served from cache
+    COUNT_CACHE_TIMEOUT = 300
+    COUNT_CACHE_KEY = 'jobalerts:count'
+    
     def __str__(self):
         return f"{self.user.username} - {self.keyword} in {self.location}"
     
+    @classmethod
+    def get_count(cls):
+        """
+        Total number of job alerts, cached between job postings. Zero is not
+        cached: the cache is per process, and a stale zero would make other
+        workers skip matching for alerts created since
+        """
+        count = cache.get(cls.COUNT_CACHE_KEY)
+        if count is None:
+            count = cls.objects.count()
+            if count:
+                cache.set(cls.COUNT_CACHE_KEY, count, cls.COUNT_CACHE_TIMEOUT)
+        return count
+    
+    @classmethod
+    def clear_count(cls):
+        """Drop the cached alert count, e.g. after a bulk insert or delete"""
+        cache.delete(cls.COUNT_CACHE_KEY)
+    
     class Meta:
         verbose_name = "Job Alert"
         verbose_name_plural = "Job Alerts"
@@ -147,10 +220,43 @@ class JobAlertNotification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Seconds the navbar's unread count may be served from cache
+    UNREAD_COUNT_CACHE_TIMEOUT = 60
+    
     def __str__(self):
         return f"Notification for {self.user.username}: {self.job.title}"
     
+    @staticmethod
+    def _unread_count_cache_key(user_id):
+        return f'unread_notifications:{user_id}'
+    
+    @classmethod
+    def get_unread_count(cls, user_id):
+        """Number of unread notifications for a user, cached between requests"""
+        key = cls._unread_count_cache_key(user_id)
+        count = cache.get(key)
+        if count is None:
+            count = cls.objects.filter(user_id=user_id, is_read=False).count()
+            cache.set(key, count, cls.UNREAD_COUNT_CACHE_TIMEOUT)
+        return count
+    
+    @classmethod
+    def clear_unread_count(cls, user_id):
+        """Drop the cached unread count, e.g. after a bulk update"""
+        cache.delete(cls._unread_count_cache_key(user_id))
+    
+    @classmethod
+    def clear_unread_counts(cls, user_ids):
+        """Drop the cached unread counts of several users at once"""
+        cache.delete_many([cls._unread_count_cache_key(user_id) for user_id in set(user_ids)])
+    
     class Meta:
         verbose_name = "Job Alert Notification"
         verbose_name_plural = "Job Alert Notifications"
         ordering = ['-created_at']
+        indexes = [
+            # Covers the unread count
+            models.Index(fields=['user', 'is_read']),
+            # A user's notification list, newest first
+            models.Index(fields=['user', '-created_at']),
+        ]
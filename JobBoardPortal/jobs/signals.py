@@ -1,9 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.db import transaction
 from django.contrib import messages
-from django.core.mail import send_mail
+from django.core.mail import send_mass_mail
 from django.conf import settings
 from django.template.loader import render_to_string
+from JobBoardPortal.companies.models import Company
 from .models import Job, JobAlert, JobAlertNotification
 import logging
 
@@ -13,86 +15,143 @@ logger = logging.getLogger(__name__)
 @receiver(post_save, sender=Job)
 def check_job_alerts(sender, instance, created, **kwargs):
     """
-    Check for matching job alerts when a new job is posted
-    and notify users about relevant opportunities.
+    Queue the job alert check for a newly posted job. It runs once the
+    surrounding transaction commits, so rolled-back jobs never notify.
     """
     if not created:
         return  # Only process new jobs, not updates
     
-    job = instance
+    if JobAlert.get_count() == 0:
+        return  # Nobody has an alert to match
     
-    # Find matching job alerts
-    matching_alerts = JobAlert.objects.filter(
-        keyword__icontains=job.title
-    ).filter(
-        location__icontains=job.location
-    )
+    job_id = instance.pk
+    transaction.on_commit(lambda: dispatch_job_alerts(job_id))
+
+
+def dispatch_job_alerts(job_id):
+    """
+    Check for job alerts matching a posted job
+    and notify users about relevant opportunities.
+    """
+    job = Job.objects.select_related('company').filter(pk=job_id).first()
+    if job is None:
+        return  # Deleted before the alerts were processed
     
-    # Also check for partial matches in job description
-    keyword_matches = JobAlert.objects.filter(
-        keyword__icontains=job.title
-    ) | JobAlert.objects.filter(
-        keyword__in=[keyword.strip() for keyword in job.title.split()]
+    # One narrow query over all alerts; the checks below decide what matches
+    alerts = JobAlert.objects.select_related('user').only(
+        'id', 'keyword', 'location',
+        'user__id', 'user__email', 'user__first_name', 'user__username',
     )
     
-    location_matches = JobAlert.objects.filter(
-        location__icontains=job.location
-    )
+    # Notifications are inserted together once all alerts have been checked
+    to_notify = []
     
-    # Combine all potential matches
-    all_matches = (matching_alerts | keyword_matches | location_matches).distinct()
+    title = job.title.lower()
+    title_words = set(title.split())
+    description = job.description.lower()
+    location = job.location.lower()
     
-    notification_count = 0
+    # Many alerts share a keyword or location, so each is only checked once
+    keyword_matches = {}
+    location_matches = {}
     
-    for alert in all_matches:
+    for alert in alerts:
         try:
             # Check if the alert criteria actually match
-            keyword_match = (
-                alert.keyword.lower() in job.title.lower() or
-                alert.keyword.lower() in job.description.lower() or
-                any(word.lower() in job.title.lower() for word in alert.keyword.split())
-            )
+            alert_location = alert.location.lower()
+            location_match = location_matches.get(alert_location)
+            if location_match is None:
+                location_match = location_matches[alert_location] = (
+                    alert_location in location or
+                    location in alert_location
+                )
+            if not location_match:
+                continue
             
-            location_match = (
-                alert.location.lower() in job.location.lower() or
-                job.location.lower() in alert.location.lower()
-            )
+            keyword = alert.keyword.lower()
+            keyword_match = keyword_matches.get(keyword)
+            if keyword_match is None:
+                words = keyword.split()
+                # Whole-word hits are a set lookup; the substring checks cover the rest
+                keyword_match = keyword_matches[keyword] = (
+                    not title_words.isdisjoint(words) or
+                    keyword in title or
+                    any(word in title for word in words) or
+                    keyword in description
+                )
             
-            if keyword_match and location_match:
-                # Send notification (you can implement email, in-app notifications, etc.)
-                send_job_alert_notification(alert, job)
-                notification_count += 1
+            if keyword_match:
+                to_notify.append(alert)
                 
         except Exception as e:
-            logger.error(f"Error processing job alert {alert.id}: {str(e)}")
+            logger.error("Error processing job alert %s: %s", alert.id, e)
+    
+    if not to_notify:
+        return
+    
+    notification_count = create_job_alert_notifications(to_notify, job)
+    
+    # Optional: Send email notifications
+    if hasattr(settings, 'EMAIL_HOST'):
+        send_job_alert_emails([alert for alert in to_notify if alert.user.email], job)
     
     if notification_count > 0:
-        logger.info(f"Sent {notification_count} job alert notifications for job: {job.title}")
+        logger.info("Sent %s job alert notifications for job: %s", notification_count, job.title)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Company)
+def clear_job_listing_state(sender, **kwargs):
+    """Make the public job pages' ETag reflect the change straight away"""
+    Job.clear_listing_state()
+
+
+@receiver(post_save, sender=JobAlert)
+@receiver(post_delete, sender=JobAlert)
+def clear_job_alert_count(sender, **kwargs):
+    """Invalidate the cached alert count when alerts are added or removed"""
+    JobAlert.clear_count()
+
+
+@receiver(post_save, sender=JobAlertNotification)
+@receiver(post_delete, sender=JobAlertNotification)
+def clear_unread_notifications_count(sender, instance, **kwargs):
+    """Invalidate the cached unread count when a notification changes"""
+    JobAlertNotification.clear_unread_count(instance.user_id)
 
 
-def send_job_alert_notification(alert, job):
+def create_job_alert_notifications(alerts, job):
     """
-    Send notification to user about matching job.
-    Creates an in-app notification and optionally sends email.
+    Create in-app notifications for the matching alerts in one batch.
+    Returns the number of notifications created.
     """
+    message = f"New job alert match: {job.title} at {job.company.name} in {job.location}"
+    notifications = [
+        JobAlertNotification(user=alert.user, job=job, job_alert=alert, message=message)
+        for alert in alerts
+    ]
+    
     try:
-        # Create in-app notification
-        message = f"New job alert match: {job.title} at {job.company.name} in {job.location}"
-        
-        notification = JobAlertNotification.objects.create(
-            user=alert.user,
-            job=job,
-            job_alert=alert,
-            message=message
-        )
-        
-        logger.info(f"Created notification {notification.id}: User {alert.user.username} - Job: {job.title} at {job.company.name}")
-        
-        # Optional: Send email notification
-        if hasattr(settings, 'EMAIL_HOST') and alert.user.email:
-            try:
-                subject = f"Job Alert: {job.title} at {job.company.name}"
-                email_message = f'''Hi {alert.user.first_name or alert.user.username},
+        JobAlertNotification.objects.bulk_create(notifications, batch_size=500)
+    except Exception as e:
+        logger.error("Error creating job alert notifications: %s", e)
+        return 0
+    
+    # bulk_create doesn't send post_save, so clear the cached counts here
+    JobAlertNotification.clear_unread_counts(alert.user_id for alert in alerts)
+    
+    logger.info("Created %s notifications for job: %s at %s", len(notifications), job.title, job.company.name)
+    return len(notifications)
+
+
+def build_job_alert_email(alert, job):
+    """
+    Build the (subject, message, from_email, recipient_list) tuple
+    emailing a user about a job matching their alert.
+    """
+    subject = f"Job Alert: {job.title} at {job.company.name}"
+    email_message = f'''Hi {alert.user.first_name or alert.user.username},
 
 A new job matching your alert "{alert.keyword}" in "{alert.location}" has been posted:
 
@@ -105,20 +164,26 @@ View the job: http://localhost:8000/jobs/{job.id}/
 
 Best regards,
 Job Board Portal Team'''
-                
-                send_mail(
-                    subject,
-                    email_message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [alert.user.email],
-                    fail_silently=True,
-                )
-                logger.info(f"Sent email notification to {alert.user.email}")
-            except Exception as e:
-                logger.error(f"Error sending email notification: {str(e)}")
-        
-        return True
-        
+    
+    return (subject, email_message, settings.DEFAULT_FROM_EMAIL, [alert.user.email])
+
+
+def send_job_alert_emails(alerts, job):
+    """
+    Email every user whose alert matched, over a single mail connection.
+    Returns the number of emails sent.
+    """
+    if not alerts:
+        return 0
+    
+    try:
+        sent = send_mass_mail(
+            [build_job_alert_email(alert, job) for alert in alerts],
+            fail_silently=True,
+        )
+        logger.info("Sent %s job alert emails for job: %s", sent, job.title)
+        return sent
+    
     except Exception as e:
-        logger.error(f"Error creating job alert notification: {str(e)}")
-        return False
\ No newline at end of file
+        logger.error("Error sending email notifications: %s", e)
+        return 0
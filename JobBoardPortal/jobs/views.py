@@ -4,25 +4,70 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, DurationField, Exists, ExpressionWrapper, F, OuterRef, Q, Value
 from .models import Job, Application, JobAlert, JobAlertNotification
 from .forms import JobForm, ApplicationForm, JobAlertForm, JobSearchForm, ApplicationStatusForm
 from JobBoardPortal.companies.models import Company
-from JobBoardPortal.accounts.mixins import EmployerRequiredMixin, JobSeekerRequiredMixin, employer_required, jobseeker_required, is_employer, is_jobseeker
+from JobBoardPortal.accounts.mixins import EmployerRequiredMixin, JobSeekerRequiredMixin, employer_required, jobseeker_required, is_employer, is_jobseeker, get_request_user_type
+import hashlib
 
 
+def job_listing_etag(request, *args, **kwargs):
+    """
+    ETag for the public job pages, built from when jobs last changed.
+    Only anonymous visitors get one; signed-in pages also show per-user
+    state such as the notification count and applied badges.
+    """
+    if request.user.is_authenticated:
+        return None
+    
+    # Jobs expire at midnight without being updated, so include the date
+    state = f'{Job.get_listing_state()}|{timezone.localdate()}'
+    return hashlib.md5(state.encode()).hexdigest()
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that caches its total count under the given key"""
+    COUNT_CACHE_TIMEOUT = 60
+    
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+    
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return super().count
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.count_cache_key, count, self.COUNT_CACHE_TIMEOUT)
+        return count
+
+
+@method_decorator([vary_on_cookie, condition(etag_func=job_listing_etag)], name='dispatch')
 class JobListView(ListView):
     """Display all active jobs"""
     model = Job
     template_name = 'jobs/job_list.html'
     context_object_name = 'jobs'
     paginate_by = 10
+    paginator_class = CachedCountPaginator
     
     def get_queryset(self):
         # Filter out expired jobs
-        queryset = Job.objects.filter(deadline__gt=timezone.now().date()).select_related('company')
+        today = timezone.localdate()
+        queryset = Job.objects.filter(deadline__gt=today).select_related('company')
+        keyword = location = ''
         
         # Handle search functionality
         form = JobSearchForm(self.request.GET)
@@ -40,7 +85,32 @@ class JobListView(ListView):
             if location:
                 queryset = queryset.filter(location__icontains=location)
         
-        return queryset.order_by('-posted_date')
+        # Identical searches on the same day share a cached result count
+        search = f'{today}|{(keyword or "").strip().lower()}|{(location or "").strip().lower()}'
+        self.count_cache_key = 'joblist:count:' + hashlib.md5(search.encode()).hexdigest()
+        
+        # Flag the jobs a job seeker has already applied for
+        if self.request.user.is_authenticated and get_request_user_type(self.request) == 'jobseeker':
+            queryset = queryset.annotate(has_applied=Exists(
+                Application.objects.filter(job=OuterRef('pk'), applicant=self.request.user)
+            ))
+        
+        # Time to the deadline, computed in the SELECT against a single "today"
+        queryset = queryset.annotate(days_left=ExpressionWrapper(
+            F('deadline') - Value(today, output_field=DateField()), output_field=DurationField()
+        ))
+        
+        # The list shows a description excerpt but never the requirements
+        return queryset.only(
+            'id', 'title', 'description', 'location', 'salary', 'deadline', 'posted_date',
+            'company__id', 'company__name',
+        ).order_by('-posted_date')
+    
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            count_cache_key=getattr(self, 'count_cache_key', None), **kwargs
+        )
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -48,6 +118,7 @@ class JobListView(ListView):
         return context
 
 
+@method_decorator([vary_on_cookie, condition(etag_func=job_listing_etag)], name='dispatch')
 class JobDetailView(DetailView):
     """Display job details with company information"""
     model = Job
@@ -55,32 +126,32 @@ class JobDetailView(DetailView):
     context_object_name = 'job'
     
     def get_queryset(self):
-        return Job.objects.select_related('company')
+        queryset = Job.objects.select_related('company')
+        
+        # Check if user has already applied as part of the job query
+        if self.request.user.is_authenticated:
+            queryset = queryset.annotate(has_applied=Exists(
+                Application.objects.filter(job=OuterRef('pk'), applicant=self.request.user)
+            ))
+        return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
-        # Check if user has already applied
-        if self.request.user.is_authenticated:
-            context['has_applied'] = Application.objects.filter(
-                job=self.object,
-                applicant=self.request.user
-            ).exists()
-        else:
-            context['has_applied'] = False
-        
+        context['has_applied'] = getattr(self.object, 'has_applied', False)
         return context
     
     def get(self, request, *args, **kwargs):
         response = super().get(request, *args, **kwargs)
         
-        # Store last visited job in session
+        # Store last visited job in session, only writing when it changed
         if request.user.is_authenticated:
-            request.session['last_visited_job'] = {
+            last_visited_job = {
                 'id': self.object.id,
                 'title': self.object.title,
                 'company': self.object.company.name
             }
+            if request.session.get('last_visited_job') != last_visited_job:
+                request.session['last_visited_job'] = last_visited_job
         
         return response
 
@@ -92,15 +163,19 @@ class JobCreateView(EmployerRequiredMixin, CreateView):
     template_name = 'jobs/job_form.html'
     success_url = reverse_lazy('jobs:job_list')
     
+    @cached_property
+    def company_id(self):
+        """The employer's company id, looked up once per request"""
+        return Company.get_id_for_user(self.request.user.id)
+    
     def form_valid(self, form):
-        # Get or create company for the employer
-        try:
-            company = Company.objects.get(user=self.request.user)
-        except Company.DoesNotExist:
+        # Attach the employer's company by id, without loading the row
+        company_id = self.company_id
+        if company_id is None:
             messages.error(self.request, 'You must create a company profile before posting jobs.')
             return redirect('companies:profile')
         
-        form.instance.company = company
+        form.instance.company_id = company_id
         messages.success(self.request, 'Job posted successfully!')
         return super().form_valid(form)
     
@@ -149,15 +224,20 @@ class JobDeleteView(EmployerRequiredMixin, DeleteView):
 @jobseeker_required
 def apply_for_job(request, pk):
     """Apply for a job (job seekers only)"""
-    job = get_object_or_404(Job, pk=pk)
+    # Check if user has already applied as part of the job query
+    job = get_object_or_404(
+        Job.objects.select_related('company').annotate(has_applied=Exists(
+            Application.objects.filter(job=OuterRef('pk'), applicant=request.user)
+        )),
+        pk=pk
+    )
     
     # Check if job is still active
     if not job.is_active:
         messages.error(request, 'This job posting has expired.')
         return redirect('jobs:job_detail', pk=pk)
     
-    # Check if user has already applied
-    if Application.objects.filter(job=job, applicant=request.user).exists():
+    if job.has_applied:
         messages.warning(request, 'You have already applied for this job.')
         return redirect('jobs:job_detail', pk=pk)
     
@@ -172,9 +252,15 @@ def apply_for_job(request, pk):
                     resume=form.cleaned_data['resume'],
                     cover_letter=form.cleaned_data.get('cover_letter', '')
                 )
-                application.save()
+                # unique_together rejects a concurrent duplicate application
+                with transaction.atomic():
+                    application.save()
                 messages.success(request, 'Application submitted successfully!')
                 return redirect('jobs:job_detail', pk=pk)
+            except IntegrityError:
+                application.resume.delete(save=False)
+                messages.warning(request, 'You have already applied for this job.')
+                return redirect('jobs:job_detail', pk=pk)
             except Exception as e:
                 messages.error(request, f'Error submitting application: {str(e)}')
         else:
@@ -206,9 +292,12 @@ class JobAlertListView(JobSeekerRequiredMixin, ListView):
     model = JobAlert
     template_name = 'jobs/job_alert_list.html'
     context_object_name = 'alerts'
+    paginate_by = 20
     
     def get_queryset(self):
-        return JobAlert.objects.filter(user=self.request.user).order_by('-created_at')
+        return JobAlert.objects.filter(user=self.request.user).only(
+            'id', 'keyword', 'location', 'created_at'
+        ).order_by('-created_at')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -249,22 +338,33 @@ class NotificationListView(JobSeekerRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        return JobAlertNotification.objects.filter(user=self.request.user).select_related('job', 'job_alert', 'job__company')
+        return JobAlertNotification.objects.filter(user=self.request.user).select_related(
+            'job', 'job_alert', 'job__company'
+        ).only(
+            'id', 'is_read', 'created_at',
+            'job__id', 'job__title', 'job__location', 'job__salary', 'job__company__id', 'job__company__name',
+            'job_alert__id', 'job_alert__keyword', 'job_alert__location',
+        )
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Mark all notifications as read when user views them
         JobAlertNotification.objects.filter(user=self.request.user, is_read=False).update(is_read=True)
+        # update() sends no post_save, so clear the cached count here
+        JobAlertNotification.clear_unread_count(self.request.user.id)
         return context
 
 
 @jobseeker_required
 def mark_notification_read(request, pk):
     """Mark a specific notification as read"""
-    notification = get_object_or_404(JobAlertNotification, pk=pk, user=request.user)
-    notification.is_read = True
-    notification.save()
-    return redirect('jobs:job_detail', pk=notification.job.pk)
+    notifications = JobAlertNotification.objects.filter(pk=pk, user=request.user)
+    job_id = get_object_or_404(notifications.values_list('job_id', flat=True))
+    
+    # Narrow UPDATE; it bypasses post_save, so clear the cached count here
+    if notifications.filter(is_read=False).update(is_read=True):
+        JobAlertNotification.clear_unread_count(request.user.id)
+    return redirect('jobs:job_detail', pk=job_id)
 
 
 class EmployerApplicationListView(EmployerRequiredMixin, ListView):
@@ -282,23 +382,27 @@ class EmployerApplicationListView(EmployerRequiredMixin, ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Get summary statistics
-        queryset = self.get_queryset()
-        context['total_applications'] = queryset.count()
-        context['pending_applications'] = queryset.filter(status='applied').count()
-        context['under_review'] = queryset.filter(status='under_review').count()
-        context['shortlisted'] = queryset.filter(status='shortlisted').count()
-        context['rejected'] = queryset.filter(status='rejected').count()
+        # Get summary statistics in a single aggregate query
+        stats = Application.objects.filter(job__company__user=self.request.user).aggregate(
+            total_applications=Count('id'),
+            pending_applications=Count('id', filter=Q(status='applied')),
+            under_review=Count('id', filter=Q(status='under_review')),
+            shortlisted=Count('id', filter=Q(status='shortlisted')),
+            rejected=Count('id', filter=Q(status='rejected')),
+        )
+        context.update(stats)
         return context
 
 
 @employer_required
 def update_application_status(request, pk):
     """Update application status (employers only)"""
-    application = get_object_or_404(Application, pk=pk)
+    application = get_object_or_404(
+        Application.objects.select_related('job__company', 'applicant'), pk=pk
+    )
     
     # Check if user owns the job
-    if application.job.company.user != request.user:
+    if application.job.company.user_id != request.user.id:
         raise PermissionDenied("You can only update applications for your own jobs.")
     
     if request.method == 'POST':
@@ -325,14 +429,20 @@ class ApplicationDetailView(LoginRequiredMixin, DetailView):
     def get_queryset(self):
         return Application.objects.select_related('job', 'job__company', 'applicant', 'applicant__userprofile')
     
+    def get_object(self, queryset=None):
+        # dispatch() already loaded the application for its permission check
+        if queryset is None and getattr(self, 'object', None) is not None:
+            return self.object
+        return super().get_object(queryset)
+    
     def dispatch(self, request, *args, **kwargs):
-        application = self.get_object()
+        self.object = application = self.get_object()
         
         # Check permissions: either the applicant or the employer can view
-        if request.user == application.applicant:
+        if request.user.id == application.applicant_id:
             # Job seeker viewing their own application
             return super().dispatch(request, *args, **kwargs)
-        elif (is_employer(request.user) and application.job.company.user == request.user):
+        elif (get_request_user_type(request) == 'employer' and application.job.company.user_id == request.user.id):
             # Employer viewing application for their job
             return super().dispatch(request, *args, **kwargs)
         else:
@@ -342,7 +452,7 @@ class ApplicationDetailView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         # Check if current user is the employer
         context['is_employer'] = (
-            is_employer(self.request.user) and 
-            self.object.job.company.user == self.request.user
+            get_request_user_type(self.request) == 'employer' and 
+            self.object.job.company.user_id == self.request.user.id
         )
         return context
@@ -8,32 +8,80 @@ from django.shortcuts import render
 from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from django.core.exceptions import ValidationError, PermissionDenied
+from django.core.files.uploadhandler import UploadFileException
 from django.http import Http404
+from django.http.multipartparser import MultiPartParserError
+
+from .validators import validate_filename
 
 logger = logging.getLogger(__name__)
 
+# Allowance for the non-file form fields and multipart boundaries
+_UPLOAD_REQUEST_OVERHEAD = 64 * 1024
+
+# Upload checks, built once at import time
+_DANGEROUS_CONTENT_TYPES = frozenset([
+    'application/x-executable',
+    'application/x-msdownload',
+    'text/javascript',
+    'application/javascript'
+])
+
+# Paths whose requests are logged as authentication attempts
+_AUTH_PATHS = frozenset(['/accounts/login/', '/accounts/register/'])
+
+# Security headers added to every response, including a basic
+# Content Security Policy
+_SECURITY_HEADERS = (
+    ('X-Content-Type-Options', 'nosniff'),
+    ('X-Frame-Options', 'DENY'),
+    ('X-XSS-Protection', '1; mode=block'),
+    ('Referrer-Policy', 'strict-origin-when-cross-origin'),
+    ('Content-Security-Policy', (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com; "
+        "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com; "
+        "font-src 'self' https://cdnjs.cloudflare.com; "
+        "img-src 'self' data:; "
+        "connect-src 'self';"
+    )),
+)
+
+
+# Exceptions reported to the user as a file upload error
+_FILE_UPLOAD_EXCEPTIONS = (UploadFileException, MultiPartParserError)
+
+
+def get_client_ip(request):
+    """Get the client IP address, parsed once per request"""
+    ip = getattr(request, '_cached_client_ip', None)
+    if ip is None:
+        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if x_forwarded_for:
+            ip = x_forwarded_for.split(',', 1)[0].strip()
+        else:
+            ip = request.META.get('REMOTE_ADDR')
+        request._cached_client_ip = ip
+    return ip
+
+
+def _is_multipart_post(request):
+    """Whether the request is a POST whose body may contain files"""
+    return request.method == 'POST' and request.content_type.startswith('multipart/')
+
+
+def _get_logged_user(request):
+    """The authenticated user to attach to a log record, or None"""
+    user = getattr(request, 'user', None)
+    return user if user is not None and user.is_authenticated else None
+
 
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """Add security headers to responses"""
     
     def process_response(self, request, response):
-        # Add security headers
-        response['X-Content-Type-Options'] = 'nosniff'
-        response['X-Frame-Options'] = 'DENY'
-        response['X-XSS-Protection'] = '1; mode=block'
-        response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-        
-        # Content Security Policy (basic)
-        csp = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com; "
-            "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://cdnjs.cloudflare.com; "
-            "font-src 'self' https://cdnjs.cloudflare.com; "
-            "img-src 'self' data:; "
-            "connect-src 'self';"
-        )
-        response['Content-Security-Policy'] = csp
-        
+        for header, value in _SECURITY_HEADERS:
+            response[header] = value
         return response
 
 
@@ -44,21 +92,23 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
         """Handle exceptions and provide appropriate responses"""
         
         # Get client IP for logging
-        client_ip = self._get_client_ip(request)
+        client_ip = get_client_ip(request)
         
         # Log the exception with additional context
-        logger.error(
-            f"Exception in {request.path}: {type(exception).__name__}: {str(exception)}",
-            exc_info=True,
-            extra={
-                'request': request,
-                'user': getattr(request, 'user', None),
-                'ip_address': client_ip,
-                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                'method': request.method,
-                'post_data': dict(request.POST) if request.method == 'POST' else None
-            }
-        )
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(
+                "Exception in %s: %s: %s",
+                request.path, type(exception).__name__, exception,
+                exc_info=True,
+                extra={
+                    'request': request,
+                    'user': getattr(request, 'user', None),
+                    'ip_address': client_ip,
+                    'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+                    'method': request.method,
+                    'post_data': list(request.POST) if request.method == 'POST' else None
+                }
+            )
         
         # Handle specific exception types
         if isinstance(exception, PermissionDenied):
@@ -69,26 +119,30 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
         
         elif isinstance(exception, Http404):
             # Log 404s for monitoring
-            logger.warning(
-                f"404 Not Found: {request.path}",
-                extra={
-                    'ip_address': client_ip,
-                    'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                    'referer': request.META.get('HTTP_REFERER', '')
-                }
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "404 Not Found: %s",
+                    request.path,
+                    extra={
+                        'ip_address': client_ip,
+                        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+                        'referer': request.META.get('HTTP_REFERER', '')
+                    }
+                )
             return render(request, '404.html', status=404)
         
         elif isinstance(exception, ValidationError):
             # Log validation errors for security monitoring
-            logger.warning(
-                f"Validation error in {request.path}: {str(exception)}",
-                extra={
-                    'ip_address': client_ip,
-                    'user': getattr(request, 'user', None),
-                    'form_data': dict(request.POST) if request.method == 'POST' else None
-                }
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Validation error in %s: %s",
+                    request.path, exception,
+                    extra={
+                        'ip_address': client_ip,
+                        'user': getattr(request, 'user', None),
+                        'form_data': list(request.POST) if request.method == 'POST' else None
+                    }
+                )
             
             # For AJAX requests, return JSON error
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -106,15 +160,17 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
             return redirect(request.META.get('HTTP_REFERER', '/'))
         
         # Handle file upload errors
-        elif 'upload' in str(exception).lower() or 'file' in str(exception).lower():
-            logger.warning(
-                f"File upload error in {request.path}: {str(exception)}",
-                extra={
-                    'ip_address': client_ip,
-                    'user': getattr(request, 'user', None),
-                    'files': list(request.FILES.keys()) if request.FILES else []
-                }
-            )
+        elif isinstance(exception, _FILE_UPLOAD_EXCEPTIONS):
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "File upload error in %s: %s",
+                    request.path, exception,
+                    extra={
+                        'ip_address': client_ip,
+                        'user': getattr(request, 'user', None),
+                        'files': list(request.FILES.keys()) if request.FILES else []
+                    }
+                )
             
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 from django.http import JsonResponse
@@ -127,7 +183,8 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
         from django.db import DatabaseError
         if isinstance(exception, DatabaseError):
             logger.critical(
-                f"Database error in {request.path}: {str(exception)}",
+                "Database error in %s: %s",
+                request.path, exception,
                 exc_info=True,
                 extra={'ip_address': client_ip}
             )
@@ -144,7 +201,8 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
         
         # For production, show generic error page
         logger.critical(
-            f"Unhandled exception in {request.path}: {type(exception).__name__}",
+            "Unhandled exception in %s: %s",
+            request.path, type(exception).__name__,
             exc_info=True,
             extra={'ip_address': client_ip}
         )
@@ -153,32 +211,48 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
             'error_type': 'Server Error',
             'message': 'An unexpected error occurred. Our team has been notified.'
         }, status=500)
-    
-    def _get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
 
 
 class FileUploadSecurityMiddleware(MiddlewareMixin):
     """Security middleware for file uploads"""
     
+    def _content_length(self, request):
+        """The declared body size, or 0 when missing or malformed"""
+        try:
+            return int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return 0
+    
     def process_request(self, request):
         """Check file uploads for security issues"""
         
-        if request.method == 'POST' and request.FILES:
+        # Runs before CsrfViewMiddleware or the view reads the body, so an
+        # oversized upload is refused without being read or spooled to disk
+        if _is_multipart_post(request) and self._content_length(request) > (
+                settings.MAX_UPLOAD_SIZE + _UPLOAD_REQUEST_OVERHEAD):
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Upload too large: %s",
+                    request.path,
+                    extra={'ip_address': get_client_ip(request)}
+                )
+            return render(request, '413.html', {
+                'max_upload_mb': f'{settings.MAX_UPLOAD_SIZE / (1024*1024):.1f}',
+            }, status=413)
+        
+        # Only multipart bodies can carry files, so other POSTs are left
+        # for the view to parse if it needs them
+        if _is_multipart_post(request) and request.FILES:
             for field_name, uploaded_file in request.FILES.items():
                 try:
                     self._validate_uploaded_file(uploaded_file)
                 except ValidationError as e:
-                    logger.warning(
-                        f"File upload validation failed for {field_name}: {str(e)}",
-                        extra={'request': request}
-                    )
+                    if logger.isEnabledFor(logging.WARNING):
+                        logger.warning(
+                            "File upload validation failed for %s: %s",
+                            field_name, e,
+                            extra={'request': request}
+                        )
                     # Let the form validation handle the error
                     pass
         
@@ -191,33 +265,12 @@ class FileUploadSecurityMiddleware(MiddlewareMixin):
         if uploaded_file.size > settings.MAX_UPLOAD_SIZE:
             raise ValidationError('File too large')
         
-        # Check filename for dangerous characters
-        import re
-        if not re.match(r'^[a-zA-Z0-9._\-\s]+$', uploaded_file.name):
-            raise ValidationError('Invalid filename')
-        
-        # Check for dangerous file extensions
-        import os
-        ext = os.path.splitext(uploaded_file.name)[1].lower()
-        dangerous_extensions = [
-            '.exe', '.bat', '.cmd', '.com', '.scr', '.vbs', 
-            '.js', '.jar', '.php', '.asp', '.aspx', '.jsp'
-        ]
-        
-        if ext in dangerous_extensions:
-            raise ValidationError('File type not allowed')
+        # Check filename for dangerous extensions and characters
+        validate_filename(uploaded_file.name)
         
         # Basic content type validation
-        if hasattr(uploaded_file, 'content_type'):
-            dangerous_types = [
-                'application/x-executable',
-                'application/x-msdownload',
-                'text/javascript',
-                'application/javascript'
-            ]
-            
-            if uploaded_file.content_type in dangerous_types:
-                raise ValidationError('File content type not allowed')
+        if getattr(uploaded_file, 'content_type', None) in _DANGEROUS_CONTENT_TYPES:
+            raise ValidationError('File content type not allowed')
 
 
 class RequestLoggingMiddleware(MiddlewareMixin):
@@ -226,82 +279,32 @@ class RequestLoggingMiddleware(MiddlewareMixin):
     def process_request(self, request):
         """Log security-relevant requests"""
         
+        if not logger.isEnabledFor(logging.INFO):
+            return None
+        
         # Log authentication attempts
-        if request.path in ['/accounts/login/', '/accounts/register/']:
+        if request.path in _AUTH_PATHS:
             logger.info(
-                f"Authentication attempt: {request.method} {request.path}",
+                "Authentication attempt: %s %s",
+                request.method, request.path,
                 extra={
-                    'ip_address': self._get_client_ip(request),
+                    'ip_address': get_client_ip(request),
                     'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                    'user': getattr(request, 'user', None)
+                    'user': _get_logged_user(request)
                 }
             )
         
-        # Log file upload attempts
-        if request.method == 'POST' and request.FILES:
+        # Log file upload attempts; only multipart bodies can carry files, so
+        # other POSTs are not parsed here
+        if _is_multipart_post(request) and request.FILES:
             logger.info(
-                f"File upload attempt: {request.path}",
+                "File upload attempt: %s",
+                request.path,
                 extra={
-                    'ip_address': self._get_client_ip(request),
+                    'ip_address': get_client_ip(request),
                     'files': list(request.FILES.keys()),
-                    'user': getattr(request, 'user', None)
-                }
-            )
-        
-        return None
-    
-    def _get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
-
-
-class CSRFFailureMiddleware(MiddlewareMixin):
-    """Handle CSRF failures gracefully"""
-    
-    def process_view(self, request, view_func, view_args, view_kwargs):
-        """Handle CSRF token failures"""
-        return None
-    
-    def process_exception(self, request, exception):
-        """Handle CSRF failures"""
-        from django.middleware.csrf import CsrfViewMiddleware
-        
-        if isinstance(exception, Exception) and 'CSRF' in str(exception):
-            logger.warning(
-                f"CSRF failure: {request.path}",
-                extra={
-                    'ip_address': self._get_client_ip(request),
-                    'user': getattr(request, 'user', None)
+                    'user': _get_logged_user(request)
                 }
             )
-            
-            # For AJAX requests
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                from django.http import JsonResponse
-                return JsonResponse({
-                    'error': 'CSRF Error',
-                    'message': 'Security token expired. Please refresh the page and try again.'
-                }, status=403)
-            
-            # For regular requests
-            from django.shortcuts import render
-            return render(request, '403.html', {
-                'csrf_error': True,
-                'message': 'Security token expired. Please refresh the page and try again.'
-            }, status=403)
         
         return None
-    
-    def _get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
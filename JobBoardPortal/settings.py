@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,9 +55,9 @@ MIDDLEWARE = [
     'JobBoardPortal.middleware.SecurityHeadersMiddleware',
     'JobBoardPortal.middleware.FileUploadSecurityMiddleware',
     'JobBoardPortal.middleware.RequestLoggingMiddleware',
+    'JobBoardPortal.accounts.middleware.UserProfileMiddleware',
     'JobBoardPortal.accounts.middleware.LastVisitedJobMiddleware',
-    # Keep these disabled for now as they might interfere with POST requests
-    # 'JobBoardPortal.middleware.CSRFFailureMiddleware',
+    # Keep this disabled for now as it might interfere with POST requests
     # 'JobBoardPortal.middleware.ErrorHandlingMiddleware',
 ]
 
@@ -143,12 +144,29 @@ STATICFILES_DIRS = [
 # This is used in production - run 'python manage.py collectstatic' to populate this directory
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Hashed static file names let the web server serve STATIC_ROOT with
+# far-future cache headers. Opt in with DJANGO_STATIC_MANIFEST=1 once the
+# deploy runs collectstatic; without the manifest every {% static %} fails
+STATIC_MANIFEST = os.environ.get('DJANGO_STATIC_MANIFEST', '').lower() in ('1', 'true')
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.ManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 # Media files (User uploaded files)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'JobBoardPortal' / 'media'
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1048576  # 1MB; larger uploads are streamed to a temp file
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 FILE_UPLOAD_PERMISSIONS = 0o644
 
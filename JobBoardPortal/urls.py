@@ -34,7 +34,7 @@ urlpatterns = [
     path('csrf-failure/', csrf_failure_view, name='csrf_failure'),
 ]
 
-# Serve media files during development
+# Serve media files during development; static files are served by the
+# staticfiles app's runserver, and by the web server in production
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS[0])
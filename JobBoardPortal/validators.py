@@ -2,14 +2,108 @@
 Custom validators for the Job Board Portal application.
 """
 
+import codecs
 import os
 import re
+from datetime import timedelta
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.utils.deconstruct import deconstructible
 from django.core.files.uploadedfile import UploadedFile
 
 
+# Validation patterns, compiled once at import time
+_FILENAME_RE = re.compile(r'^[a-zA-Z0-9._\-\s]+$')
+_PHONE_SEPARATORS_RE = re.compile(r'[\s\-\(\)]')
+_PHONE_RE = re.compile(r'^[+]?[0-9]{10,15}$')
+_NAME_RE = re.compile(r'^[a-zA-Z\s\'\-]{2,30}$')
+_EMAIL_RE = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+_URL_SCHEME_RE = re.compile(r'^https?://')
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+
+# Extensions that are never accepted, whatever the field allows
+_DANGEROUS_EXTENSIONS = frozenset([
+    '.exe', '.bat', '.cmd', '.com', '.scr', '.vbs', '.js', '.jar',
+    '.php', '.asp', '.aspx', '.jsp', '.sh', '.ps1'
+])
+
+# Characters rejected in email addresses
+_EMAIL_DANGEROUS_CHARS = frozenset('<>"\'&;(){}')
+
+# Characters rejected in search queries
+_SEARCH_DANGEROUS_CHARS = frozenset('<>"\'&')
+
+# Common weak passwords, compared case-insensitively
+_WEAK_PASSWORDS = frozenset([
+    'password', '12345678', 'qwerty', 'abc123', 'password123',
+    'admin', 'letmein', 'welcome', 'monkey', '1234567890'
+])
+
+# Each family of suspicious patterns is one case-insensitive alternation
+_DANGEROUS_MARKUP_RE = re.compile('|'.join([
+    r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>',
+    r'javascript:',
+    r'on\w+\s*=',
+    r'<iframe',
+    r'<object',
+    r'<embed',
+    r'<form',
+    r'<input',
+    r'<link',
+    r'<meta',
+]), re.IGNORECASE)
+_SQL_INJECTION_RE = re.compile('|'.join([
+    r'\b(select|insert|update|delete|drop|create|alter|exec|union)\b.*\b(from|where|into)\b',
+    r'(--|\/\*|\*\/)',
+    r"(\b(or|and)\b.*=.*')",
+    r"'.*(\bor\b|\band\b).*'",
+]), re.IGNORECASE)
+_SUSPICIOUS_EMAIL_RE = re.compile('|'.join([
+    r'\.{2,}',  # Multiple consecutive dots
+    r'^\.|\.$',  # Starting or ending with dot
+    r'@.*@',  # Multiple @ symbols
+]))
+_SUSPICIOUS_URL_RE = re.compile('|'.join([
+    r'<script',
+    r'javascript:',
+    r'on\w+\s*=',
+    r'\.\./',  # Directory traversal
+]), re.IGNORECASE)
+
+# Characters of the previous chunk rescanned with the next one when streaming
+# a file. Longer than any fixed pattern above; open-ended ones (script blocks,
+# SQL statements) are caught across a boundary when they span up to this many
+_CONTENT_SCAN_OVERLAP = 4096
+
+# Latest allowed future date, relative to today (about 2 years)
+_MAX_FUTURE_DATE_DELTA = timedelta(days=730)
+
+
+def _check_extension(ext, allowed_extensions):
+    """Check a lowercased extension against the allowed ones"""
+    if ext not in allowed_extensions:
+        raise ValidationError(
+            f'Invalid file extension. Allowed: {", ".join(allowed_extensions)}'
+        )
+
+
+def _check_size(value, max_size):
+    """Check an uploaded file against a maximum size in bytes"""
+    if hasattr(value, 'size') and value.size > max_size:
+        max_mb = max_size / (1024 * 1024)
+        raise ValidationError(f'File too large. Maximum size: {max_mb:.1f}MB')
+
+
+def _check_content_type(value, allowed_types):
+    """Check an uploaded file's declared content type"""
+    if hasattr(value, 'content_type') and value.content_type not in allowed_types:
+        raise ValidationError(
+            f'Invalid file type. Allowed: {", ".join(allowed_types)}'
+        )
+
+
 @deconstructible
 class FileExtensionValidator:
     """Validate file extensions"""
@@ -19,11 +113,7 @@ class FileExtensionValidator:
     
     def __call__(self, value):
         if value:
-            ext = os.path.splitext(value.name)[1].lower()
-            if ext not in self.allowed_extensions:
-                raise ValidationError(
-                    f'Invalid file extension. Allowed: {", ".join(self.allowed_extensions)}'
-                )
+            _check_extension(os.path.splitext(value.name)[1].lower(), self.allowed_extensions)
 
 
 @deconstructible
@@ -34,12 +124,8 @@ class FileSizeValidator:
         self.max_size = max_size
     
     def __call__(self, value):
-        if value and hasattr(value, 'size'):
-            if value.size > self.max_size:
-                max_mb = self.max_size / (1024 * 1024)
-                raise ValidationError(
-                    f'File too large. Maximum size: {max_mb:.1f}MB'
-                )
+        if value:
+            _check_size(value, self.max_size)
 
 
 @deconstructible
@@ -50,11 +136,8 @@ class FileContentTypeValidator:
         self.allowed_types = allowed_types
     
     def __call__(self, value):
-        if value and hasattr(value, 'content_type'):
-            if value.content_type not in self.allowed_types:
-                raise ValidationError(
-                    f'Invalid file type. Allowed: {", ".join(self.allowed_types)}'
-                )
+        if value:
+            _check_content_type(value, self.allowed_types)
 
 
 @deconstructible
@@ -63,30 +146,29 @@ class FilenameValidator:
     
     def __call__(self, value):
         if value:
-            filename = os.path.basename(value.name)
-            # Check for dangerous characters
-            if not re.match(r'^[a-zA-Z0-9._\-\s]+$', filename):
-                raise ValidationError(
-                    'Filename contains invalid characters. Use only letters, numbers, spaces, dots, hyphens, and underscores.'
-                )
-            
-            # Check for dangerous extensions or patterns
-            dangerous_patterns = [
-                r'\.exe$', r'\.bat$', r'\.cmd$', r'\.com$', r'\.scr$',
-                r'\.vbs$', r'\.js$', r'\.jar$', r'\.php$', r'\.asp$'
-            ]
-            
-            for pattern in dangerous_patterns:
-                if re.search(pattern, filename.lower()):
-                    raise ValidationError('File type not allowed for security reasons.')
+            validate_filename(os.path.basename(value.name))
+
+
+def validate_filename(filename):
+    """Validate an uploaded file's name, cheapest check first"""
+    # Check for dangerous extensions
+    _, dot, ext = filename.rpartition('.')
+    if dot and f'.{ext.lower()}' in _DANGEROUS_EXTENSIONS:
+        raise ValidationError('File type not allowed for security reasons.')
+    
+    # Check for dangerous characters, which also rejects path separators
+    if not _FILENAME_RE.match(filename):
+        raise ValidationError(
+            'Filename contains invalid characters. Use only letters, numbers, spaces, dots, hyphens, and underscores.'
+        )
 
 
 def validate_phone_number(value):
     """Validate phone number format"""
     if value:
         # Remove spaces, dashes, parentheses for validation
-        clean_phone = re.sub(r'[\s\-\(\)]', '', value)
-        if not re.match(r'^[+]?[0-9]{10,15}$', clean_phone):
+        clean_phone = _PHONE_SEPARATORS_RE.sub('', value)
+        if not _PHONE_RE.match(clean_phone):
             raise ValidationError('Enter a valid phone number (10-15 digits).')
 
 
@@ -94,7 +176,7 @@ def validate_name(value):
     """Validate name fields (first name, last name)"""
     if value:
         value = value.strip()
-        if not re.match(r'^[a-zA-Z\s\'\-]{2,30}$', value):
+        if not _NAME_RE.match(value):
             raise ValidationError('Name must be 2-30 characters, letters, spaces, apostrophes, and hyphens only.')
 
 
@@ -127,12 +209,12 @@ def validate_future_date(value):
     """Validate that date is in the future"""
     if value:
         from django.utils import timezone
-        if value <= timezone.now().date():
+        today = timezone.localdate()
+        if value <= today:
             raise ValidationError('Date must be in the future.')
         
         # Check if date is not too far in the future (2 years)
-        max_date = timezone.now().date().replace(year=timezone.now().year + 2)
-        if value > max_date:
+        if value - today > _MAX_FUTURE_DATE_DELTA:
             raise ValidationError('Date cannot be more than 2 years in the future.')
 
 
@@ -140,11 +222,9 @@ def validate_search_query(value):
     """Validate search query for security"""
     if value:
         value = value.strip()
-        # Basic XSS prevention
-        dangerous_chars = ['<', '>', '"', "'", '&', 'script', 'javascript']
-        for char in dangerous_chars:
-            if char.lower() in value.lower():
-                raise ValidationError('Search query contains invalid characters.')
+        # Basic XSS prevention; 'script' also covers 'javascript'
+        if not _SEARCH_DANGEROUS_CHARS.isdisjoint(value) or 'script' in value.lower():
+            raise ValidationError('Search query contains invalid characters.')
 
 
 def validate_text_content(value, min_length=10, max_length=None):
@@ -172,44 +252,40 @@ document_content_validator = FileContentTypeValidator(settings.ALLOWED_DOCUMENT_
 def validate_no_malicious_content(value):
     """Validate that text content doesn't contain malicious code"""
     if value:
-        value_lower = value.lower()
-        
         # Check for script tags and javascript
-        dangerous_patterns = [
-            r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>',
-            r'javascript:',
-            r'on\w+\s*=',
-            r'<iframe',
-            r'<object',
-            r'<embed',
-            r'<form',
-            r'<input',
-            r'<link',
-            r'<meta'
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, value_lower):
-                raise ValidationError('Content contains potentially dangerous code.')
+        if _DANGEROUS_MARKUP_RE.search(value):
+            raise ValidationError('Content contains potentially dangerous code.')
         
         # Check for SQL injection patterns
-        sql_patterns = [
-            r'\b(select|insert|update|delete|drop|create|alter|exec|union)\b.*\b(from|where|into)\b',
-            r'(--|\/\*|\*\/)',
-            r"(\b(or|and)\b.*=.*')",
-            r"'.*(\bor\b|\band\b).*'"
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, value_lower):
-                raise ValidationError('Content contains invalid characters.')
+        if _SQL_INJECTION_RE.search(value):
+            raise ValidationError('Content contains invalid characters.')
+
+
+def validate_file_no_malicious_content(value):
+    """Validate an uploaded text file chunk by chunk instead of reading it whole"""
+    chunks = value.chunks()
+    first_chunk = next(chunks, b'')
+    if b'\x00' in first_chunk:
+        return  # Binary files are OK
+
+    def all_chunks():
+        yield first_chunk
+        yield from chunks
+
+    # Each chunk is scanned together with the tail of the previous one, so a
+    # match that straddles a chunk boundary is still found
+    tail = ''
+    for text in codecs.iterdecode(all_chunks(), 'utf-8', errors='ignore'):
+        window = tail + text
+        validate_no_malicious_content(window)
+        tail = window[-_CONTENT_SCAN_OVERLAP:]
 
 
 def validate_email_security(value):
     """Enhanced email validation with security checks"""
     if value:
         # Basic format validation
-        if not re.match(r'^[^\s@]+@[^\s@]+\.[^\s@]+$', value):
+        if not _EMAIL_RE.match(value):
             raise ValidationError('Enter a valid email address.')
         
         # Length validation
@@ -217,28 +293,19 @@ def validate_email_security(value):
             raise ValidationError('Email address is too long.')
         
         # Check for dangerous characters
-        dangerous_chars = ['<', '>', '"', "'", '&', ';', '(', ')', '{', '}']
-        for char in dangerous_chars:
-            if char in value:
-                raise ValidationError('Email contains invalid characters.')
+        if not _EMAIL_DANGEROUS_CHARS.isdisjoint(value):
+            raise ValidationError('Email contains invalid characters.')
         
         # Check for suspicious patterns
-        suspicious_patterns = [
-            r'\.{2,}',  # Multiple consecutive dots
-            r'^\.|\.$',  # Starting or ending with dot
-            r'@.*@',  # Multiple @ symbols
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, value):
-                raise ValidationError('Email format is invalid.')
+        if _SUSPICIOUS_EMAIL_RE.search(value):
+            raise ValidationError('Email format is invalid.')
 
 
 def validate_url_security(value):
     """Validate URL with security checks"""
     if value:
         # Basic URL validation
-        if not re.match(r'^https?://', value):
+        if not _URL_SCHEME_RE.match(value):
             raise ValidationError('URL must start with http:// or https://')
         
         # Check for dangerous protocols
@@ -248,16 +315,8 @@ def validate_url_security(value):
                 raise ValidationError('URL protocol not allowed.')
         
         # Check for suspicious patterns
-        suspicious_patterns = [
-            r'<script',
-            r'javascript:',
-            r'on\w+\s*=',
-            r'\.\./',  # Directory traversal
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, value.lower()):
-                raise ValidationError('URL contains invalid content.')
+        if _SUSPICIOUS_URL_RE.search(value):
+            raise ValidationError('URL contains invalid content.')
 
 
 def validate_password_strength(value):
@@ -268,22 +327,17 @@ def validate_password_strength(value):
         if len(value) < 8:
             errors.append('Password must be at least 8 characters long.')
         
-        if not re.search(r'[A-Z]', value):
+        if not _UPPERCASE_RE.search(value):
             errors.append('Password must contain at least one uppercase letter.')
         
-        if not re.search(r'[a-z]', value):
+        if not _LOWERCASE_RE.search(value):
             errors.append('Password must contain at least one lowercase letter.')
         
-        if not re.search(r'\d', value):
+        if not _DIGIT_RE.search(value):
             errors.append('Password must contain at least one number.')
         
         # Check for common weak passwords
-        weak_passwords = [
-            'password', '12345678', 'qwerty', 'abc123', 'password123',
-            'admin', 'letmein', 'welcome', 'monkey', '1234567890'
-        ]
-        
-        if value.lower() in weak_passwords:
+        if value.lower() in _WEAK_PASSWORDS:
             errors.append('Password is too common. Please choose a stronger password.')
         
         if errors:
@@ -304,50 +358,23 @@ class ComprehensiveFileValidator:
         if not value:
             return
         
-        # File extension validation
-        ext = os.path.splitext(value.name)[1].lower()
-        if ext not in self.allowed_extensions:
-            raise ValidationError(
-                f'Invalid file extension. Allowed: {", ".join(self.allowed_extensions)}'
-            )
-        
-        # File size validation
-        if hasattr(value, 'size') and value.size > self.max_size:
-            max_mb = self.max_size / (1024 * 1024)
-            raise ValidationError(f'File too large. Maximum size: {max_mb:.1f}MB')
-        
-        # Content type validation
-        if hasattr(value, 'content_type') and value.content_type not in self.allowed_types:
-            raise ValidationError(
-                f'Invalid file type. Allowed: {", ".join(self.allowed_types)}'
-            )
-        
-        # Filename security validation
         filename = os.path.basename(value.name)
-        if not re.match(r'^[a-zA-Z0-9._\-\s]+$', filename):
-            raise ValidationError(
-                'Filename contains invalid characters. Use only letters, numbers, spaces, dots, hyphens, and underscores.'
-            )
-        
-        # Check for dangerous file extensions
-        dangerous_extensions = [
-            '.exe', '.bat', '.cmd', '.com', '.scr', '.vbs', '.js', '.jar',
-            '.php', '.asp', '.aspx', '.jsp', '.sh', '.ps1'
-        ]
+        ext = os.path.splitext(filename)[1].lower()
         
-        if ext in dangerous_extensions:
-            raise ValidationError('File type not allowed for security reasons.')
+        # Cheapest checks first: size, extension, content type, filename
+        _check_size(value, self.max_size)
+        _check_extension(ext, self.allowed_extensions)
+        _check_content_type(value, self.allowed_types)
+        validate_filename(filename)
         
         # Content validation for text files (if enabled)
-        if self.check_content and ext in ['.txt', '.csv']:
+        if self.check_content and ext in ('.txt', '.csv'):
             try:
-                content = value.read().decode('utf-8')
-                validate_no_malicious_content(content)
-                value.seek(0)  # Reset file pointer
-            except UnicodeDecodeError:
-                pass  # Binary files are OK
+                validate_file_no_malicious_content(value)
             except Exception as e:
                 raise ValidationError('File content validation failed.')
+            finally:
+                value.seek(0)  # Reset file pointer
 
 
 # Predefined comprehensive validators
@@ -10,6 +10,7 @@ from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views import View
+from .middleware import get_client_ip
 
 logger = logging.getLogger(__name__)
 
@@ -23,46 +24,41 @@ class ValidationErrorReportView(View):
             data = json.loads(request.body)
             
             # Log the validation error for monitoring
-            logger.warning(
-                f"Client-side validation error: {data.get('error', 'Unknown')}",
-                extra={
-                    'field': data.get('field'),
-                    'url': data.get('url'),
-                    'timestamp': data.get('timestamp'),
-                    'user': request.user if request.user.is_authenticated else 'Anonymous',
-                    'ip_address': self._get_client_ip(request)
-                }
-            )
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "Client-side validation error: %s",
+                    data.get('error', 'Unknown'),
+                    extra={
+                        'field': data.get('field'),
+                        'url': data.get('url'),
+                        'timestamp': data.get('timestamp'),
+                        'user': request.user if request.user.is_authenticated else 'Anonymous',
+                        'ip_address': get_client_ip(request)
+                    }
+                )
             
             return JsonResponse({'status': 'logged'})
             
         except (json.JSONDecodeError, Exception) as e:
-            logger.error(f"Error processing validation error report: {str(e)}")
+            logger.error("Error processing validation error report: %s", e)
             return JsonResponse({'error': 'Invalid request'}, status=400)
-    
-    def _get_client_ip(self, request):
-        """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
 
 
 @require_POST
 @login_required
 def csrf_failure_view(request, reason=""):
     """Handle CSRF failures gracefully"""
-    logger.warning(
-        f"CSRF failure for user {request.user}: {reason}",
-        extra={
-            'user': request.user,
-            'ip_address': request.META.get('REMOTE_ADDR'),
-            'path': request.path,
-            'reason': reason
-        }
-    )
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(
+            "CSRF failure for user %s: %s",
+            request.user, reason,
+            extra={
+                'user': request.user,
+                'ip_address': get_client_ip(request),
+                'path': request.path,
+                'reason': reason
+            }
+        )
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({